@@ -5,15 +5,79 @@ Fetches MARA and BTC data, prints human-readable explainer report, optionally em
 """
 
 import requests
-import yfinance as yf
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import argparse
+import heapq
 import json
 import os
-import smtplib
+import pickle
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
-from email.mime.text import MIMEText
-from typing import Dict, Any, List, Optional
+from email.utils import formatdate
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 
+try:
+    import orjson  # optional: parses the multi-MB SEC companyfacts JSON several times faster
+except ImportError:
+    orjson = None
+
+# One keep-alive session for CoinGecko + SEC; retries back off on 429/5xx
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': 'MARA-Valuation-Tool/1.0 (educational-use@example.com)',
+    'Accept-Encoding': 'gzip, deflate',
+})
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,  # main() runs up to 5 fetch threads; don't drop connections on "pool is full"
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+))
+
+
+class _TokenBucket:
+    """Thread-safe client-side throttle: refills `rate` tokens/s up to `capacity`, blocks when empty"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens < 1:
+                time.sleep((1 - self.tokens) / self.rate)
+                self.tokens = 1
+                self.last = time.monotonic()
+            self.tokens -= 1
+
+
+# SEC bans clients above 10 req/s; stay just under it across threads and callers
+_SEC_LIMITER = _TokenBucket(rate=9, capacity=9)
+
+
+def _sec_get(url: str, **kwargs) -> requests.Response:
+    """_SESSION.get for sec.gov URLs, paced by _SEC_LIMITER"""
+    _SEC_LIMITER.acquire()
+    return _SESSION.get(url, **kwargs)
+
+# Comma/space-separated ALERT_RECIPIENTS entries
+_RECIP_RE = re.compile(r"[^,\s]+")
+
 # Flags
 OVERRIDE_MODE = os.getenv("OVERRIDE_MODE", "0") == "1"
 OVERRIDE_PATH = os.getenv("OVERRIDE_PATH", "overrides/core_quarters.json")
@@ -25,6 +89,23 @@ METRIC_SHORT = "ACMPE"
 # === Feature flags ===
 SHOW_FORWARD = os.getenv("SHOW_FORWARD", "0") == "1"
 
+# Re-runs within this many seconds with unchanged BTC price / market cap reuse the last Yahoo/SEC data (0 disables)
+RUN_CACHE_TTL = int(os.getenv("RUN_CACHE_TTL", "900"))
+RUN_CACHE_PATH = os.path.join(".cache", "last_run.json")
+
+# Structured copy of each run (metrics, signals, decision) for dashboards/trend tooling; empty disables
+REPORT_JSON_PATH = os.getenv("REPORT_JSON_PATH", "report.json")
+
+# SEC ticker file plus a pickled {ticker: cik10} index built from it; refreshed when older than 7 days
+TICKERS_PATH = "company_tickers.json"
+TICKERS_INDEX_PATH = os.path.join(".cache", "company_tickers.pkl")
+TICKERS_MAX_AGE = 7 * 24 * 3600
+
+# On-disk copies of SEC companyfacts: trusted outright for SEC_FACTS_TTL seconds, then revalidated
+# with ETag / If-Modified-Since (filings land at most a few times a quarter)
+SEC_CACHE_DIR = ".cache"
+SEC_FACTS_TTL = int(os.getenv("SEC_FACTS_TTL", str(24 * 3600)))
+
 # Manual TTM dataset for when SEC quarters don't align
 MARA_MANUAL_QUARTERS = [
     {
@@ -64,9 +145,17 @@ MARA_MANUAL_QUARTERS = [
 # Flag to use manual TTM dataset
 USE_MANUAL_TTM = os.getenv("USE_MANUAL_TTM", "0") == "1"
 
+# XBRL fiscal-period tags for single-quarter facts (checked first: most quarterly facts carry one)
+_QUARTERLY_FP = frozenset(("Q1", "Q2", "Q3", "Q4"))
+
+
+# Bound format methods: the spec is parsed once, each call is a single C-level format
+_DOLLARS = "${:,.0f}".format
+_MULT = "{:.1f}x".format
+
 
 def fmt_dollars(x: Optional[float]) -> str:
-    return "Not found" if x is None else f"${x:,.0f}"
+    return "Not found" if x is None else _DOLLARS(x)
 
 
 def fmt_float(x: Optional[float], decimals: int = 2) -> str:
@@ -74,7 +163,7 @@ def fmt_float(x: Optional[float], decimals: int = 2) -> str:
 
 
 def fmt_mult(x: float | None) -> str:
-    return "N/A" if (x is None) else f"{x:.1f}x"
+    return "N/A" if x is None else _MULT(x)
 
 
 @dataclass
@@ -87,17 +176,28 @@ class DecisionCriteria:
 
 def get_btc_price():
     try:
-        r = requests.get("https://api.coingecko.com/api/v3/simple/price",
+        r = _SESSION.get("https://api.coingecko.com/api/v3/simple/price",
                          params={"ids": "bitcoin", "vs_currencies": "usd"}, timeout=5)
         r.raise_for_status()
         return r.json()["bitcoin"]["usd"]
     except Exception as e:
         print(f"Error fetching BTC price: {e}")
-        return float(input("Enter BTC price manually: "))
+        return None
+
+def first_present(row: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    """Value of the first label in `keys` present in a statement row dict, else None"""
+    return next((row[k] for k in keys if k in row), None)
+
+
+@lru_cache(maxsize=1)
+def _mara():
+    """Shared yfinance Ticker for MARA (yfinance memoizes fetched data per instance)"""
+    import yfinance as yf  # heavy (pandas/numpy); only pay for it when actually fetching
+    return yf.Ticker("MARA")
 
 def get_mara_market_cap():
     try:
-        mara = yf.Ticker("MARA")
+        mara = _mara()
         mc = mara.info.get("marketCap")
         if mc:
             return mc
@@ -105,34 +205,31 @@ def get_mara_market_cap():
             raise ValueError("Market cap not found")
     except Exception as e:
         print(f"Error fetching MARA market cap: {e}")
-        return float(input("Enter MARA market cap manually: "))
+        return None
 
+@lru_cache(maxsize=1)
 def fetch_mara_financials():
     """Fetch real MARA quarterly financial data"""
     try:
-        mara = yf.Ticker("MARA")
+        mara = _mara()
         
         # Get quarterly income statement (replaces deprecated earnings)
         income_stmt = mara.quarterly_income_stmt
         balance_sheet = mara.quarterly_balance_sheet
         
         if income_stmt is not None and not income_stmt.empty:
-            latest_quarter = income_stmt.iloc[:, 0]  # First column is most recent quarter
+            latest_quarter = income_stmt.iloc[:, 0].to_dict()  # First column is most recent quarter
             ts = income_stmt.columns[0]  # pandas Timestamp
             quarter_name = f"{ts.year}Q{ts.quarter}"
             
             # Get Net Income
-            net_income = latest_quarter.get('Net Income', None)
-            if net_income is None:
-                net_income = latest_quarter.get('Net Income Common Stockholders', None)
+            net_income = first_present(latest_quarter, ('Net Income', 'Net Income Common Stockholders'))
             
             # Get Cash from balance sheet
             cash = None
             if balance_sheet is not None and not balance_sheet.empty:
-                latest_balance = balance_sheet.iloc[:, 0]  # Most recent quarter
-                cash = latest_balance.get('Cash And Cash Equivalents', None)
-                if cash is None:
-                    cash = latest_balance.get('Cash', None)
+                latest_balance = balance_sheet.iloc[:, 0].to_dict()  # Most recent quarter
+                cash = first_present(latest_balance, ('Cash And Cash Equivalents', 'Cash'))
             
             if net_income is not None:
                 return {
@@ -153,29 +250,68 @@ def fetch_mara_financials():
         print(f"❌ Error fetching MARA financials: {e}")
         return None
 
+def _download_company_tickers():
+    """Download SEC company_tickers.json to TICKERS_PATH (conditional GET when a copy exists)"""
+    print("📥 Downloading SEC company_tickers.json …")
+    url = "https://www.sec.gov/files/company_tickers.json"
+    headers = {}
+    if os.path.exists(TICKERS_PATH):
+        headers["If-Modified-Since"] = formatdate(os.path.getmtime(TICKERS_PATH), usegmt=True)
+    with _sec_get(url, headers=headers, timeout=10, stream=True) as resp:
+        if resp.status_code == 304:
+            # Unchanged upstream: restart the refresh window, keep the pickled index valid
+            os.utime(TICKERS_PATH)
+            if os.path.exists(TICKERS_INDEX_PATH):
+                os.utime(TICKERS_INDEX_PATH)
+            print("✅ Company tickers unchanged")
+            return
+        resp.raise_for_status()
+        # Stream to a temp file and swap it in once complete, so an interrupted
+        # download never leaves a fresh-looking partial TICKERS_PATH
+        tmp_path = TICKERS_PATH + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                for chunk in resp.iter_content(chunk_size=64 * 1024):
+                    f.write(chunk)
+            os.replace(tmp_path, TICKERS_PATH)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    print("✅ Cached company tickers")
+
+
+@lru_cache(maxsize=1)
+def _ticker_index() -> Dict[str, str]:
+    """{ticker: 10-digit CIK}, loaded from the pickle or rebuilt once from company_tickers.json"""
+    if not os.path.exists(TICKERS_PATH):
+        _download_company_tickers()
+    elif time.time() - os.path.getmtime(TICKERS_PATH) > TICKERS_MAX_AGE:
+        try:
+            _download_company_tickers()
+        except Exception as e:
+            print(f"⚠️ Could not refresh company tickers, using cached copy: {e}")
+
+    if os.path.exists(TICKERS_INDEX_PATH) and os.path.getmtime(TICKERS_INDEX_PATH) >= os.path.getmtime(TICKERS_PATH):
+        with open(TICKERS_INDEX_PATH, "rb") as f:
+            return pickle.load(f)
+
+    with open(TICKERS_PATH, "rb") as f:
+        tickers = _loads(f.read())  # dict: "0": {"ticker": "...", "cik_str": 1234567, ...}, ...
+    index = {c["ticker"]: str(c["cik_str"]).zfill(10) for c in tickers.values() if "ticker" in c and "cik_str" in c}
+
+    os.makedirs(os.path.dirname(TICKERS_INDEX_PATH), exist_ok=True)
+    with open(TICKERS_INDEX_PATH, "wb") as f:
+        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return index
+
+
 def get_cik_from_ticker(ticker):
     """Get 10-digit CIK from SEC company_tickers.json"""
     try:
-        cache_file = "company_tickers.json"
-
-        if not os.path.exists(cache_file):
-            print("📥 Downloading SEC company_tickers.json …")
-            url = "https://www.sec.gov/files/company_tickers.json"
-            headers = {'User-Agent': 'MARA-Valuation-Tool/1.0 (educational-use@example.com)'}
-            resp = requests.get(url, headers=headers, timeout=10)
-            resp.raise_for_status()
-            with open(cache_file, "w") as f:
-                f.write(resp.text)
-            print("✅ Cached company tickers")
-
-        with open(cache_file, "r") as f:
-            tickers = json.load(f)  # dict: "0": {"ticker": "...", "cik_str": 1234567, ...}, ...
-
-        t = ticker.upper()
-        for _, company in tickers.items():
-            if company.get("ticker") == t:
-                cik10 = str(company.get("cik_str")).zfill(10)
-                return cik10
+        cik10 = _ticker_index().get(ticker.upper())
+        if cik10:
+            return cik10
 
         print(f"⚠️ Ticker {ticker} not found in SEC database")
         return None
@@ -184,24 +320,188 @@ def get_cik_from_ticker(ticker):
         print(f"❌ Error getting CIK: {e}")
         return None
 
+def _loads(raw: bytes) -> Any:
+    """Parse JSON bytes with orjson when installed, else stdlib json"""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _dumps(obj: Any, default=None) -> bytes:
+    """Serialize to JSON bytes with orjson when installed, else stdlib json"""
+    return orjson.dumps(obj, default=default) if orjson is not None else json.dumps(obj, default=default).encode()
+
+
+def _usd(us_gaap: Dict[str, Any], concept: str) -> Optional[List[Dict[str, Any]]]:
+    """USD fact list for a us-gaap concept, or None if the concept/unit is missing"""
+    try:
+        return us_gaap[concept]["units"]["USD"]
+    except KeyError:
+        return None
+
+
+# Debt concepts read by fetch_sec_financials: (us-gaap concept, results key)
+SEC_DEBT_CONCEPTS = (
+    ("DebtCurrent", "debt_current"),
+    ("LongTermDebtNoncurrent", "long_term_debt"),
+    ("LongTermDebtAndCapitalLeaseObligations", "long_term_debt_and_capital_leases"),
+    ("ShortTermBorrowings", "short_term_borrowings"),
+    ("NotesPayableCurrent", "notes_payable_current"),
+)
+
+
+# Concept-name filter for custom digital-asset reval scans (one regex pass instead of several `in` checks)
+_DIGITAL_ASSET_RE = re.compile(r"digitalasset|crypto|bitcoin|btc", re.IGNORECASE)
+# Taxonomies that never carry digital-asset P&L concepts
+_SKIP_TAXONOMIES = frozenset(("dei", "srt", "country", "currency", "stpr"))
+
+# Standard us-gaap P&L reval concepts, in order of preference
+REVAL_CONCEPTS = (
+    "NetRealizedAndUnrealizedGainLossOnInvestments",
+    "UnrealizedGainLossOnInvestments",
+    "RealizedGainLossOnInvestments",
+)
+
+# companyfacts JSON per CIK, downloaded at most once per run
+_companyfacts_cache: Dict[str, Dict[str, Any]] = {}
+_companyfacts_lock = threading.Lock()
+
+
+def _companyfacts_disk_paths(cik: str) -> Tuple[str, str]:
+    """(body, meta) cache paths for a CIK's companyfacts"""
+    base = os.path.join(SEC_CACHE_DIR, f"sec_facts_{cik}")
+    return base + ".json", base + ".meta"
+
+
+def _fetch_companyfacts_raw(cik: str) -> bytes:
+    """companyfacts body for a CIK; a 304 on the conditional GET serves the copy on disk"""
+    body_path, meta_path = _companyfacts_disk_paths(cik)
+    if os.path.exists(body_path) and time.time() - os.path.getmtime(body_path) < SEC_FACTS_TTL:
+        with open(body_path, "rb") as f:
+            return f.read()
+
+    headers = {}
+    if os.path.exists(body_path) and os.path.exists(meta_path):
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
+    r = _sec_get(url, headers=headers, timeout=15)
+    if r.status_code == 304:
+        os.utime(body_path)  # still current: restart the TTL window
+        with open(body_path, "rb") as f:
+            return f.read()
+    r.raise_for_status()
+
+    os.makedirs(SEC_CACHE_DIR, exist_ok=True)
+    # Drop the old validators first and swap each file in whole, so a kill mid-write can't leave
+    # a truncated body or an ETag that belongs to a different body
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    meta = {"etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified")}
+    _atomic_write(body_path, r.content)
+    _atomic_write(meta_path, json.dumps(meta).encode())
+    return r.content
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Write data to path via a temp file + os.replace"""
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _get_companyfacts(cik: str) -> Dict[str, Any]:
+    """Fetch SEC companyfacts (XBRL) JSON for a CIK, reusing the copy already downloaded this run.
+    Thread-safe: concurrent first callers wait on a single download instead of each fetching it."""
+    if cik not in _companyfacts_cache:
+        with _companyfacts_lock:
+            if cik not in _companyfacts_cache:
+                _companyfacts_cache[cik] = _loads(_fetch_companyfacts_raw(cik))
+    return _companyfacts_cache[cik]
+
+
+def _quarterly_by_end(facts: List[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]], int]:
+    """
+    Collapse quarterly USD facts to {end: {'val', 'filed'}}, keeping the latest filing per end date
+    (restatements). Also returns how many quarterly facts were seen.
+    """
+    quarterly_data = {}
+    quarterly_count = 0
+    for fact in facts:
+        # Check if it's quarterly data
+        if (fact.get("fp") in _QUARTERLY_FP or 
+            fact.get("qtrs") == 1 or 
+            fact.get("dur") == "P3M"):
+            
+            quarterly_count += 1
+            end_date = fact.get("end")
+            if end_date:
+                # If multiple values exist for same end date, pick the one with latest filed date
+                if end_date not in quarterly_data or fact.get("filed", "") > quarterly_data[end_date].get("filed", ""):
+                    quarterly_data[end_date] = {
+                        "val": fact.get("val"),
+                        "filed": fact.get("filed")
+                    }
+    return quarterly_data, quarterly_count
+
+
+def _latest_by_end(quarterly_data: Dict[str, Dict[str, Any]], n: int) -> Dict[str, Dict[str, Any]]:
+    """The latest n end dates of an end-keyed series (most recent first) without sorting them all"""
+    return {end: quarterly_data[end] for end in heapq.nlargest(n, quarterly_data)}
+
+
+def _vals_by_end(series: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """{end: val} for an end-keyed series, skipping missing values"""
+    return {end: fact["val"] for end, fact in series.items() if fact.get("val") is not None}
+
+
+def _first_available_concept(cik: str, candidates, n: int = 12) -> Tuple[str, Dict[str, Dict[str, Any]]]:
+    """
+    Return (concept, series) for the first candidate in us-gaap that has quarterly data, with the
+    series in fetch_sec_quarterly_values' shape: latest n end dates, deduplicated by filing date.
+    Works off the cached companyfacts JSON, so trying several candidates costs no extra SEC requests.
+    """
+    try:
+        us_gaap = _get_companyfacts(cik).get("facts", {}).get("us-gaap", {})
+    except Exception as e:
+        print(f"   ⚠️  Could not load SEC companyfacts: {e}")
+        return "", {}
+
+    for concept in candidates:
+        quarterly_data, _ = _quarterly_by_end(_usd(us_gaap, concept) or [])
+        if quarterly_data:
+            return concept, _latest_by_end(quarterly_data, n)
+    return "", {}
+
+
+@lru_cache(maxsize=1)
 def fetch_sec_financials():
-    """Fetch MARA financial data from SEC filings using proper API strategy"""
+    """Fetch MARA financial data from SEC filings using proper API strategy (memoized, don't mutate the result)"""
     try:
         print("🔍 Fetching SEC filing data...")
         
-        # helper function to get most recent entry by end date
-        def latest_by_end(items):
-            return max(items, key=lambda x: x.get("end", ""))
-        
-        # helper function to get most recent quarterly entry
+        # helper function to get most recent quarterly entry (single pass, no throwaway lists)
         def latest_quarterly(items):
             # Prefer quarterly points: fp in Q1..Q4 OR qtrs == 1 OR duration 'P3M'
-            quarterly = [
-                x for x in items
-                if x.get("fp") in {"Q1","Q2","Q3","Q4"} or x.get("qtrs") == 1 or x.get("dur") == "P3M"
-            ]
-            pool = quarterly or items  # fallback if none tagged
-            return max(pool, key=lambda x: x.get("end", ""))
+            best_q = best_any = None
+            best_q_end = best_any_end = None
+            for x in items:
+                end = x.get("end", "")
+                if best_any is None or end > best_any_end:
+                    best_any, best_any_end = x, end
+                if (x.get("fp") in _QUARTERLY_FP or x.get("qtrs") == 1 or x.get("dur") == "P3M") and \
+                        (best_q is None or end > best_q_end):
+                    best_q, best_q_end = x, end
+            return best_q or best_any  # fallback if none tagged
         
         # Step 1: Get CIK from ticker
         cik = get_cik_from_ticker("MARA")
@@ -211,88 +511,65 @@ def fetch_sec_financials():
         
         print(f"   Found CIK: {cik}")
         
-        # Step 2: Rate limiting
-        import time
-        time.sleep(0.1)  # 10 requests per second max
-        
-        # Step 3: Get company facts (XBRL data)
-        url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
-        headers = {
-            'User-Agent': 'MARA-Valuation-Tool/1.0 (educational-use@example.com)',
-            'Accept': 'application/json',
-            'Accept-Encoding': 'gzip, deflate',
-            'Host': 'data.sec.gov'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=15)
-        print(f"   SEC API Status: {response.status_code}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            us_gaap = data.get("facts", {}).get("us-gaap", {})
-            results = {}
-
-            # Net Income
-            ni_units = us_gaap.get("NetIncomeLoss", {}).get("units", {}).get("USD", [])
-            if ni_units:
-                latest_ni = latest_quarterly(ni_units)
-                results["net_income"] = latest_ni.get("val")
-                results["ni_period"] = latest_ni.get("end")
-                print(f"   Found Quarterly Net Income: ${results['net_income']:,.0f} ({results['ni_period']})")
-
-            # Interest Expense
-            int_units = us_gaap.get("InterestExpense", {}).get("units", {}).get("USD", [])
-            if int_units:
-                latest_interest = latest_quarterly(int_units)
-                results["interest"] = latest_interest.get("val")
-                results["interest_period"] = latest_interest.get("end")
-                print(f"   Found Quarterly Interest: ${results['interest']:,.0f}")
-
-            # Use strict P&L reval filtering (no balance sheet levels)
-            strict_reval = sec_reval_series_strict(12)
-            if strict_reval:
-                # Find reval for the same period as Net Income
-                ni_end = results.get("ni_period")
-                if ni_end and ni_end in strict_reval:
-                    reval_data = strict_reval[ni_end]
-                    results["btc_reval"] = reval_data["val"]
-                    results["btc_reval_concept"] = reval_data["src"]
-                    results["btc_reval_period"] = ni_end
-                    print(f"   Found P&L reval: ${results['btc_reval']:,.0f} ({results['btc_reval_concept']}) [{ni_end}]")
-                else:
-                    print(f"   ⚠️  No P&L reval found for NI period {ni_end}")
-                    results["btc_reval"] = None
-                    results["btc_reval_period"] = None
+        # Step 2: Get company facts (XBRL data), shared with the per-concept lookups below
+        data = _get_companyfacts(cik)
+        us_gaap = data.get("facts", {}).get("us-gaap", {})
+        results = {}
+
+        # Net Income
+        ni_units = _usd(us_gaap, "NetIncomeLoss")
+        if ni_units:
+            latest_ni = latest_quarterly(ni_units)
+            results["net_income"] = latest_ni.get("val")
+            results["ni_period"] = latest_ni.get("end")
+            print(f"   Found Quarterly Net Income: ${results['net_income']:,.0f} ({results['ni_period']})")
+
+        # Interest Expense
+        int_units = _usd(us_gaap, "InterestExpense")
+        if int_units:
+            latest_interest = latest_quarterly(int_units)
+            results["interest"] = latest_interest.get("val")
+            results["interest_period"] = latest_interest.get("end")
+            print(f"   Found Quarterly Interest: ${results['interest']:,.0f}")
+
+        # Use strict P&L reval filtering (no balance sheet levels)
+        strict_reval = sec_reval_series_strict(12)
+        results["reval_series"] = strict_reval
+        if strict_reval:
+            # Find reval for the same period as Net Income
+            ni_end = results.get("ni_period")
+            if ni_end and ni_end in strict_reval:
+                reval_data = strict_reval[ni_end]
+                results["btc_reval"] = reval_data["val"]
+                results["btc_reval_concept"] = reval_data["src"]
+                results["btc_reval_period"] = ni_end
+                print(f"   Found P&L reval: ${results['btc_reval']:,.0f} ({results['btc_reval_concept']}) [{ni_end}]")
             else:
-                print(f"   ⚠️  No P&L reval concepts found")
+                print(f"   ⚠️  No P&L reval found for NI period {ni_end}")
                 results["btc_reval"] = None
                 results["btc_reval_period"] = None
-
-            # Debt: add a few common concepts and take the most recent quarterly for each
-            debt_cur = us_gaap.get("DebtCurrent", {}).get("units", {}).get("USD", [])
-            lt_debt = us_gaap.get("LongTermDebtNoncurrent", {}).get("units", {}).get("USD", [])
-            lt_debt_leases = us_gaap.get("LongTermDebtAndCapitalLeaseObligations", {}).get("units", {}).get("USD", [])
-            st_borrow = us_gaap.get("ShortTermBorrowings", {}).get("units", {}).get("USD", [])
-            notes_cur = us_gaap.get("NotesPayableCurrent", {}).get("units", {}).get("USD", [])
-
-            def pick(items, label):
-                if items:
-                    d = latest_quarterly(items)
-                    val = d.get("val")
-                    if val is not None:
-                        results[label] = val
-
-            pick(debt_cur, "debt_current")
-            pick(lt_debt, "long_term_debt")
-            pick(lt_debt_leases, "long_term_debt_and_capital_leases")
-            pick(st_borrow, "short_term_borrowings")
-            pick(notes_cur, "notes_payable_current")
-
-            return results
-            
         else:
-            print(f"⚠️  SEC API returned status {response.status_code}")
-            return None
+            print(f"   ⚠️  No P&L reval concepts found")
+            results["btc_reval"] = None
+            results["btc_reval_period"] = None
+
+        # Debt: add a few common concepts and take the most recent quarterly for each
+        for concept, label in SEC_DEBT_CONCEPTS:
+            items = _usd(us_gaap, concept)
+            if items:
+                val = latest_quarterly(items).get("val")
+                if val is not None:
+                    results[label] = val
+
+        # Per-period series for the 4Q core build (served from the companyfacts cache above)
+        ni_s, ie_s, fv_s, ct_s, pl_reval_s = fetch_core_series()
+        results["ni_series"] = ni_s
+        results["ie_series"] = ie_s
+        results["fv_series"] = fv_s
+        results["ct_series"] = ct_s
+        results["pl_reval_series"] = pl_reval_s
+
+        return results
             
     except Exception as e:
         print(f"❌ Error fetching SEC data: {e}")
@@ -301,20 +578,85 @@ def fetch_sec_financials():
 def get_total_debt():
     """Get total debt from Yahoo Finance"""
     try:
-        mara = yf.Ticker("MARA")
+        mara = _mara()
         balance_sheet = mara.balance_sheet
         
         if balance_sheet.empty:
             return None
         
-        # Get most recent total debt
-        total_debt = balance_sheet.loc['Total Debt'].iloc[0]
+        # Get most recent total debt (scalar lookup; no intermediate row Series)
+        total_debt = balance_sheet.at['Total Debt', balance_sheet.columns[0]]
         return float(total_debt)
     except Exception as e:
         print(f"Error getting total debt: {e}")
         return None
 
 
+def _threshold_rule(available, passes, pass_reason, fail_reason, missing_reason: str):
+    """Build a signal rule scoring +1 when `passes`, -1 otherwise, 0 when the inputs are missing"""
+    def rule(m: Dict[str, Any], c: DecisionCriteria) -> Tuple[int, List[str]]:
+        if not available(m):
+            return 0, [missing_reason]
+        if passes(m, c):
+            return 1, [pass_reason(m, c)]
+        return -1, [fail_reason(m, c)]
+    return rule
+
+
+def _normalized_ni_rule(m: Dict[str, Any], c: DecisionCriteria) -> Tuple[int, List[str]]:
+    """Normalized NI (remove BTC reval; add back interest)"""
+    reported_ni = m.get("reported_ni")
+    btc_reval = m.get("btc_reval")
+    interest = m.get("interest")
+    if reported_ni is None:
+        return 0, ["Reported NI not available."]
+    if btc_reval is None:
+        if c.require_interest_and_reval:
+            return 0, ["Missing BTC revaluation; cannot compute normalized earnings under strict mode."]
+        return 0, ["Missing BTC revaluation; normalized NI partially unavailable."]
+
+    normalized = reported_ni - btc_reval
+    if normalized >= c.min_adj_ni:
+        delta, reasons = 1, [f"Adj NI {fmt_dollars(normalized)} ≥ {fmt_dollars(c.min_adj_ni)} (core earnings OK)."]
+    else:
+        delta, reasons = -1, [f"Adj NI {fmt_dollars(normalized)} < {fmt_dollars(c.min_adj_ni)} (core earnings weak)."]
+    if interest is not None:
+        reasons.append(f"Adj NI (no debt) {fmt_dollars(normalized + interest)} (interest burden isolated).")
+    return delta, reasons
+
+
+# evaluate_signals rules, in report order: (name, rule(metrics, crit) -> (score delta, reasons))
+SIGNAL_RULES = (
+    # 1) mNAV signal
+    ("mnav", _threshold_rule(
+        lambda m: m.get("mnav") is not None,
+        lambda m, c: m["mnav"] <= c.mnav_max_buy,
+        lambda m, c: f"mNAV {m['mnav']:.2f}x ≤ {c.mnav_max_buy:.2f}x (trading near treasury value).",
+        lambda m, c: f"mNAV {m['mnav']:.2f}x > {c.mnav_max_buy:.2f}x (premium vs treasury).",
+        "mNAV not available.",
+    )),
+    # 2) NAV sanity (positive NAV helps)
+    ("nav", _threshold_rule(
+        lambda m: m.get("nav_simple") is not None,
+        lambda m, c: m["nav_simple"] > 0,
+        lambda m, c: f"NAV positive at {fmt_dollars(m['nav_simple'])}.",
+        lambda m, c: f"NAV negative at {fmt_dollars(m['nav_simple'])}.",
+        "NAV not available.",
+    )),
+    # 3) Normalized NI
+    ("normalized_ni", _normalized_ni_rule),
+    # 4) ACMPE-TTM signal (new mining P/E metric); conservative 20x threshold, RBV must be positive
+    ("acmpe_ttm", _threshold_rule(
+        lambda m: m.get("acmpe_ttm") is not None and m.get("rbv") is not None,
+        lambda m, c: m["rbv"] > 0 and m["acmpe_ttm"] <= 20,
+        lambda m, c: f"ACMPE-TTM {m['acmpe_ttm']:.1f}x ≤ 20x (mining operations reasonably priced).",
+        lambda m, c: (f"ACMPE-TTM {m['acmpe_ttm']:.1f}x > 20x (mining operations expensive)." if m["rbv"] > 0
+                      else f"RBV {fmt_dollars(m['rbv'])} ≤ 0 (market prices at/under asset value)."),
+        "ACMPE-TTM not available (insufficient aligned data).",
+    )),
+)
+
+
 def evaluate_signals(metrics: Dict[str, Any], crit: DecisionCriteria) -> Dict[str, Any]:
     """
     Input metrics should include:
@@ -329,79 +671,14 @@ def evaluate_signals(metrics: Dict[str, Any], crit: DecisionCriteria) -> Dict[st
     """
     reasons: List[str] = []
     score = 0
+    for _, rule in SIGNAL_RULES:
+        delta, rule_reasons = rule(metrics, crit)
+        score += delta
+        reasons.extend(rule_reasons)
 
-    mnav = metrics.get("mnav")
-    nav_simple = metrics.get("nav_simple")
     reported_ni = metrics.get("reported_ni")
     btc_reval = metrics.get("btc_reval")
-    interest = metrics.get("interest")
-    acmpe_ttm = metrics.get("acmpe_ttm")
-    rbv = metrics.get("rbv")
-
-    # 1) mNAV signal
-    if mnav is not None:
-        if mnav <= crit.mnav_max_buy:
-            reasons.append(f"mNAV {mnav:.2f}x ≤ {crit.mnav_max_buy:.2f}x (trading near treasury value).")
-            score += 1
-        else:
-            reasons.append(f"mNAV {mnav:.2f}x > {crit.mnav_max_buy:.2f}x (premium vs treasury).")
-            score -= 1
-    else:
-        reasons.append("mNAV not available.")
-    
-    # 2) NAV sanity (positive NAV helps)
-    if nav_simple is not None:
-        if nav_simple > 0:
-            reasons.append(f"NAV positive at {fmt_dollars(nav_simple)}.")
-            score += 1
-        else:
-            reasons.append(f"NAV negative at {fmt_dollars(nav_simple)}.")
-            score -= 1
-    else:
-        reasons.append("NAV not available.")
-
-    # 3) Normalized NI (remove BTC reval; add back interest)
-    normalized = None
-    if reported_ni is not None:
-        if btc_reval is not None:
-            normalized = reported_ni - btc_reval
-            if interest is not None:
-                normalized_no_debt = normalized + interest
-            else:
-                normalized_no_debt = None
-
-            if normalized is not None:
-                if normalized >= crit.min_adj_ni:
-                    reasons.append(f"Adj NI {fmt_dollars(normalized)} ≥ {fmt_dollars(crit.min_adj_ni)} (core earnings OK).")
-                    score += 1
-                else:
-                    reasons.append(f"Adj NI {fmt_dollars(normalized)} < {fmt_dollars(crit.min_adj_ni)} (core earnings weak).")
-                    score -= 1
-
-            if normalized_no_debt is not None:
-                reasons.append(f"Adj NI (no debt) {fmt_dollars(normalized_no_debt)} (interest burden isolated).")
-        else:
-            if crit.require_interest_and_reval:
-                reasons.append("Missing BTC revaluation; cannot compute normalized earnings under strict mode.")
-            else:
-                reasons.append("Missing BTC revaluation; normalized NI partially unavailable.")
-    else:
-        reasons.append("Reported NI not available.")
-
-    # 4) ACMPE-TTM signal (new mining P/E metric)
-    if acmpe_ttm is not None and rbv is not None:
-        if rbv > 0:
-            if acmpe_ttm <= 20:  # Conservative threshold
-                reasons.append(f"ACMPE-TTM {acmpe_ttm:.1f}x ≤ 20x (mining operations reasonably priced).")
-                score += 1
-            else:
-                reasons.append(f"ACMPE-TTM {acmpe_ttm:.1f}x > 20x (mining operations expensive).")
-                score -= 1
-        else:
-            reasons.append(f"RBV {fmt_dollars(rbv)} ≤ 0 (market prices at/under asset value).")
-            score -= 1
-    else:
-        reasons.append("ACMPE-TTM not available (insufficient aligned data).")
+    normalized = reported_ni - btc_reval if reported_ni is not None and btc_reval is not None else None
 
     return {
         "reasons": reasons,
@@ -428,138 +705,176 @@ def make_recommendation(result: Dict[str, Any]) -> Dict[str, str]:
 
 
 def build_report(metrics: Dict[str, Any], eval_out: Dict[str, Any], decision: Dict[str, str], sec_data: Optional[Dict[str, Any]] = None, proj_rows: Optional[List[Dict[str, Any]]] = None) -> str:
-    lines = []
-    lines.append("=== MARA Miner Valuation — Explainer ===")
-    lines.append("")
-    lines.append("[1] Inputs (Today)")
-    lines.append(f"   • BTC Price:         {fmt_dollars(metrics.get('btc_price'))}")
-    lines.append(f"   • MARA Market Cap:   {fmt_dollars(metrics.get('market_cap'))}")
-    lines.append(f"   • BTC Holdings:      50,639 BTC (assumed)")
-    lines.append(f"   • Treasury Value:    {fmt_dollars(metrics.get('treasury_value'))}")
-    lines.append(f"   • Cash:              {fmt_dollars(metrics.get('cash'))}")
-    lines.append(f"   • Total Debt:        {fmt_dollars(metrics.get('total_debt'))}")
-    lines.append("")
-    lines.append("[2] Core Metrics")
-    lines.append(f"   • NAV  = Treasury + Cash − Debt = {fmt_dollars(metrics.get('nav_simple'))}")
+    # Variable-shape sections are joined up front; the fixed skeleton is one template below
     mnav = metrics.get('mnav')
-    lines.append(f"   • mNAV = Market Cap / Treasury   = {fmt_mult(mnav)}")
     
-    # Add ACMPE-TTM
+    # ACMPE-TTM
     acmpe = metrics.get('acmpe_ttm')
     rbv = metrics.get('rbv')
     core_ttm = metrics.get('core_ttm')
-    
     if acmpe is not None:
-        lines.append(f"   • ACMPE-TTM = RBV ÷ Core TTM = {fmt_mult(acmpe)}")
-        lines.append(f"   • RBV (Residual Business Value) = {fmt_dollars(rbv)}")
-        lines.append(f"   • Core TTM (4 quarters) = {fmt_dollars(core_ttm)}")
-        lines.append("   (Backcasted using ΔFV−ΔCost; pre-2025 removes only downside; interest imputed when missing).")
+        acmpe_block = (
+            f"   • ACMPE-TTM = RBV ÷ Core TTM = {fmt_mult(acmpe)}\n"
+            f"   • RBV (Residual Business Value) = {fmt_dollars(rbv)}\n"
+            f"   • Core TTM (4 quarters) = {fmt_dollars(core_ttm)}\n"
+            "   (Backcasted using ΔFV−ΔCost; pre-2025 removes only downside; interest imputed when missing)."
+        )
     else:
-        lines.append("   • ACMPE-TTM = N/A (insufficient data or RBV ≤ 0)")
+        acmpe_block = "   • ACMPE-TTM = N/A (insufficient data or RBV ≤ 0)"
     
-    # Add ACMPE-RunRate if available
+    # ACMPE-RunRate if available
     acmpe_runrate = metrics.get('acmpe_runrate')
     if acmpe_runrate is not None:
-        lines.append(f"   • ACMPE-RunRate (last qtr ×4) = {fmt_mult(acmpe_runrate)}")
+        acmpe_block += f"\n   • ACMPE-RunRate (last qtr ×4) = {fmt_mult(acmpe_runrate)}"
     
-    # Add ACMPE-FWD (only if enabled and credible)
+    # ACMPE-FWD (only if enabled and credible)
     acmpe_fwd = metrics.get('acmpe_fwd')
     if acmpe_fwd is not None:
-        lines.append(f"   • ACMPE-FWD (Base) = RBV ÷ Core_q = {fmt_mult(acmpe_fwd)}")
+        fwd_line = f"   • ACMPE-FWD (Base) = RBV ÷ Core_q = {fmt_mult(acmpe_fwd)}"
     elif SHOW_FORWARD:
-        lines.append("   • ACMPE-FWD (Base) = N/A (inputs not credible)")
+        fwd_line = "   • ACMPE-FWD (Base) = N/A (inputs not credible)"
     else:
-        lines.append("   • ACMPE-FWD (Base) = Disabled (set SHOW_FORWARD=1)")
+        fwd_line = "   • ACMPE-FWD (Base) = Disabled (set SHOW_FORWARD=1)"
     
-    lines.append("")
-    lines.append("[3] Normalization (strip BTC volatility, isolate debt)")
     ni_p = sec_data.get('ni_period') if sec_data else None
     rev_p = sec_data.get('btc_reval_period') if sec_data else None
     int_p = sec_data.get('interest_period') if sec_data else None
-    
-    lines.append(f"   • Reported Net Income [SEC]: {fmt_dollars(metrics.get('reported_ni'))}" + (f" [{ni_p}]" if ni_p else ""))
-    br = metrics.get('btc_reval')
     br_tag = sec_data.get('btc_reval_concept') if sec_data else None
-    lines.append(f"   • BTC Revaluation (SEC):     {fmt_dollars(br)}" + (f" [{br_tag}]" if br_tag else "") + (f" [{rev_p}]" if rev_p else ""))
-    lines.append(f"   • Interest Expense (SEC):    {fmt_dollars(metrics.get('interest'))}" + (f" [{int_p}]" if int_p else ""))
+    ni_tag = f" [{ni_p}]" if ni_p else ""
+    br_tags = (f" [{br_tag}]" if br_tag else "") + (f" [{rev_p}]" if rev_p else "")
+    int_tag = f" [{int_p}]" if int_p else ""
     
     if metrics["adj_ni"] is not None:
-        lines.append(f"   • Adjusted NI: {fmt_dollars(metrics['adj_ni'])}")
-        lines.append(f"   • Adjusted NI (no debt): {fmt_dollars(metrics['adj_ni_no_debt'])}")
+        adj_block = (
+            f"   • Adjusted NI: {fmt_dollars(metrics['adj_ni'])}\n"
+            f"   • Adjusted NI (no debt): {fmt_dollars(metrics['adj_ni_no_debt'])}"
+        )
     else:
-        lines.append("   • Adjusted NI: Skipped — different quarters.")
+        adj_block = "   • Adjusted NI: Skipped — different quarters."
     
-    # Add quarterly history table (using backcasted data)
-    lines.append("")
-    lines.append("[3b] Last 4 Quarters")
+    # Quarterly history table (using backcasted data)
     history_rows = metrics.get('history_rows', [])
     if history_rows:
         hdr = "MANUAL OVERRIDES (Peyton)" if metrics.get("override_used") else "SEC-aligned/backcast"
-        lines.append(f"   Source: {hdr} — Policy: pre-ASU removes losses only; post-ASU full reval.")
-        lines.append("   Period       NI           RevalUsed     Interest     Core (= NI - Reval + Int)   Policy   Source")
-        lines.append("   " + "-" * 100)
-        for row in history_rows:
-            period = row["period"][:10] if row["period"] else "Unknown"
-            ni_val = row.get('ni', row.get('reported_ni', 0))
-            reval_val = row.get('reval_used', 0)
-            interest_val = row.get('interest', row.get('interest_used', 0))
-            core_val = row.get('core', 0)
-            policy = row.get('policy', '')
-            source = row.get('source', '')
-            
-            lines.append(f"   {period:<12} {fmt_dollars(ni_val):<11} {fmt_dollars(reval_val):<11} {fmt_dollars(interest_val):<11} {fmt_dollars(core_val):<11} {policy:<8} {source}")
+        history_block = "\n".join([
+            f"   Source: {hdr} — Policy: pre-ASU removes losses only; post-ASU full reval.",
+            "   Period       NI           RevalUsed     Interest     Core (= NI - Reval + Int)   Policy   Source",
+            "   " + "-" * 100,
+            *(
+                f"   {row['period'][:10] if row['period'] else 'Unknown':<12} "
+                f"{fmt_dollars(row.get('ni', row.get('reported_ni', 0))):<11} "
+                f"{fmt_dollars(row.get('reval_used', 0)):<11} "
+                f"{fmt_dollars(row.get('interest', row.get('interest_used', 0))):<11} "
+                f"{fmt_dollars(row.get('core', 0)):<11} "
+                f"{row.get('policy', ''):<8} {row.get('source', '')}"
+                for row in history_rows
+            ),
+        ])
     else:
-        lines.append("   ⚠️  Could not build quarterly history (missing data)")
-    
-    # Add normalization explanation
-    lines.append("")
-    lines.append("   Normalization: We remove BTC price swings and add back interest.")
-    lines.append("   Core = Net Income - Revaluation + Interest Expense")
-    lines.append("   This isolates operational performance from BTC volatility and debt costs.")
-    lines.append("   Rule: Pre-ASU quarters don't book BTC gains in NI, so we only remove losses there; post-ASU we remove the full revaluation (gain or loss).")
+        history_block = "   ⚠️  Could not build quarterly history (missing data)"
     
-    # Add overrides note if used
-    if metrics.get("override_used"):
-        lines.append("")
-        lines.append("NOTE: Core uses MANUAL OVERRIDES supplied by Peyton (policy enforced).")
-    
-    # Add forward projection table
-    lines.append("")
-    lines.append("[3c] Forward Projection (Constant BTC)")
-    lines.append("   " + "-" * 80)
+    # Overrides note if used
+    overrides_note = "\n\nNOTE: Core uses MANUAL OVERRIDES supplied by Peyton (policy enforced)." if metrics.get("override_used") else ""
     
+    # Forward projection table
     if proj_rows:
-        lines.append("   Scenario   BTC Mined   Revenue        Power Cost     Core_q        ACMPE-FWD")
-        lines.append("   " + "-" * 80)
-        for r in proj_rows:
-            lines.append(f"   {r['name']:<9}  {r['btc_mined']:.2f}      {fmt_dollars(r['revenue']):>12}  {fmt_dollars(r['power_cost']):>12}  {fmt_dollars(r['core_q']):>12}  {fmt_mult(r['acmpe_fwd']):>9}")
+        proj_block = "\n".join([
+            "   Scenario   BTC Mined   Revenue        Power Cost     Core_q        ACMPE-FWD",
+            "   " + "-" * 80,
+            *(
+                f"   {r['name']:<9}  {r['btc_mined']:.2f}      {fmt_dollars(r['revenue']):>12}  {fmt_dollars(r['power_cost']):>12}  {fmt_dollars(r['core_q']):>12}  {fmt_mult(r['acmpe_fwd']):>9}"
+                for r in proj_rows
+            ),
+        ])
     elif SHOW_FORWARD:
-        lines.append("   Disabled (inputs not credible - check parameters)")
+        proj_block = "   Disabled (inputs not credible - check parameters)"
     else:
-        lines.append("   Disabled (set SHOW_FORWARD=1 and provide real inputs)")
+        proj_block = "   Disabled (set SHOW_FORWARD=1 and provide real inputs)"
+    
+    reasons_block = "".join(f"\n   • {r}" for r in eval_out["reasons"])
     
-    lines.append("")
-    lines.append("[4] Signals — Step‑by‑Step Reasoning")
-    for r in eval_out["reasons"]:
-        lines.append(f"   • {r}")
-    lines.append("")
-    lines.append("[5] TL;DR")
-    lines.append(f"   ACTION: {decision['action']} — {decision['summary']}")
-    lines.append("")
-    lines.append("Note: Educational tool. Not financial advice. Data may be delayed or incomplete.")
-    return "\n".join(lines)
-
-
-def send_email_report(body: str, subject: str, to_emails: List[str]) -> bool:
+    return f"""=== MARA Miner Valuation — Explainer ===
+
+[1] Inputs (Today)
+   • BTC Price:         {fmt_dollars(metrics.get('btc_price'))}
+   • MARA Market Cap:   {fmt_dollars(metrics.get('market_cap'))}
+   • BTC Holdings:      50,639 BTC (assumed)
+   • Treasury Value:    {fmt_dollars(metrics.get('treasury_value'))}
+   • Cash:              {fmt_dollars(metrics.get('cash'))}
+   • Total Debt:        {fmt_dollars(metrics.get('total_debt'))}
+
+[2] Core Metrics
+   • NAV  = Treasury + Cash − Debt = {fmt_dollars(metrics.get('nav_simple'))}
+   • mNAV = Market Cap / Treasury   = {fmt_mult(mnav)}
+{acmpe_block}
+{fwd_line}
+
+[3] Normalization (strip BTC volatility, isolate debt)
+   • Reported Net Income [SEC]: {fmt_dollars(metrics.get('reported_ni'))}{ni_tag}
+   • BTC Revaluation (SEC):     {fmt_dollars(metrics.get('btc_reval'))}{br_tags}
+   • Interest Expense (SEC):    {fmt_dollars(metrics.get('interest'))}{int_tag}
+{adj_block}
+
+[3b] Last 4 Quarters
+{history_block}
+
+   Normalization: We remove BTC price swings and add back interest.
+   Core = Net Income - Revaluation + Interest Expense
+   This isolates operational performance from BTC volatility and debt costs.
+   Rule: Pre-ASU quarters don't book BTC gains in NI, so we only remove losses there; post-ASU we remove the full revaluation (gain or loss).{overrides_note}
+
+[3c] Forward Projection (Constant BTC)
+   {"-" * 80}
+{proj_block}
+
+[4] Signals — Step‑by‑Step Reasoning{reasons_block}
+
+[5] TL;DR
+   ACTION: {decision['action']} — {decision['summary']}
+
+Note: Educational tool. Not financial advice. Data may be delayed or incomplete."""
+
+
+
+def _format_subject(action: str, mnav: float, acmpe: Optional[float], acmpe_fwd: Optional[float]) -> str:
+    """Email subject with key metrics (ACMPE-FWD only if enabled and credible)"""
+    acmpe_str = f"ACMPE:{acmpe:.1f}x" if acmpe else "ACMPE:N/A"
+    subject = f"MARA Signal — {action} | mNAV:{mnav:.2f}x | {acmpe_str}"
+    if acmpe_fwd is not None:
+        subject += f" | ACMPE-FWD:{acmpe_fwd:.1f}x"
+    return subject
+
+
+def _smtp_config() -> Tuple[Optional[str], int, Optional[str], Optional[str], Optional[str]]:
+    """(host, port, user, password, from_addr) from the SMTP_* env vars"""
+    user = os.getenv("SMTP_USER")
+    return (os.getenv("SMTP_HOST"), int(os.getenv("SMTP_PORT", "587")), user,
+            os.getenv("SMTP_PASS"), os.getenv("SMTP_FROM", user))
+
+
+@contextmanager
+def smtp_session():
+    """
+    Logged-in SMTP connection from the SMTP_* env vars; pass it to several send_email_report
+    calls to pay TLS + AUTH once. Port 465 uses implicit TLS (SMTP_SSL), others STARTTLS.
+    """
+    import smtplib
+    host, port, user, pwd, _ = _smtp_config()
+    conn = smtplib.SMTP_SSL(host, port, timeout=10) if port == 465 else smtplib.SMTP(host, port, timeout=10)
+    with conn:
+        if port != 465:
+            conn.starttls()
+        conn.login(user, pwd)
+        yield conn
+
+
+def send_email_report(body: str, subject: str, to_emails: List[str], session=None) -> bool:
     """
     Uses SMTP with env vars:
       SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASS, SMTP_FROM
+    Reuses `session` (from smtp_session()) when given, else opens and closes its own connection.
     """
-    host = os.getenv("SMTP_HOST")
-    port = int(os.getenv("SMTP_PORT", "587"))
-    user = os.getenv("SMTP_USER")
-    pwd  = os.getenv("SMTP_PASS")
-    from_addr = os.getenv("SMTP_FROM", user)
+    host, port, user, pwd, from_addr = _smtp_config()
 
     if not (host and user and pwd and from_addr):
         print("⚠️ Email not sent (missing SMTP env vars).")
@@ -573,15 +888,17 @@ def send_email_report(body: str, subject: str, to_emails: List[str]) -> bool:
         return False
 
     try:
+        from email.mime.text import MIMEText
         msg = MIMEText(body, "plain", "utf-8")
         msg["Subject"] = subject
         msg["From"] = from_addr
         msg["To"] = ", ".join(to_emails)
 
-        with smtplib.SMTP(host, port, timeout=10) as s:
-            s.starttls()
-            s.login(user, pwd)
-            s.sendmail(from_addr, to_emails, msg.as_string())
+        if session is not None:
+            session.sendmail(from_addr, to_emails, msg.as_string())
+        else:
+            with smtp_session() as s:
+                s.sendmail(from_addr, to_emails, msg.as_string())
         print("📧 Email sent.")
         return True
     except Exception as e:
@@ -589,28 +906,38 @@ def send_email_report(body: str, subject: str, to_emails: List[str]) -> bool:
         return False
 
 
+_last_email_state: Optional[Dict[str, Any]] = None
+
+
 def should_send_email(action: str, period: str) -> bool:
     """
     Check if we should send email based on state changes.
     Only send when action or period changes.
     """
+    global _last_email_state
     state_file = ".mara_last.json"
     
     try:
-        # Read current state
-        if os.path.exists(state_file):
-            with open(state_file, "r") as f:
-                last_state = json.load(f)
-        else:
-            last_state = {"action": None, "period": None}
+        # Read current state (once per process)
+        if _last_email_state is None:
+            if os.path.exists(state_file):
+                with open(state_file, "rb") as f:
+                    _last_email_state = _loads(f.read())
+            else:
+                _last_email_state = {"action": None, "period": None}
         
         # Check if anything changed
-        changed = (last_state.get("action") != action or 
-                  last_state.get("period") != period)
+        changed = (_last_email_state.get("action") != action or 
+                  _last_email_state.get("period") != period)
         
-        # Update state
-        with open(state_file, "w") as f:
-            json.dump({"action": action, "period": period}, f)
+        # Update state only on change; write-then-rename so a crash can't leave a torn file
+        if changed:
+            new_state = {"action": action, "period": period}
+            tmp_file = state_file + ".tmp"
+            with open(tmp_file, "wb") as f:
+                f.write(_dumps(new_state))
+            os.replace(tmp_file, state_file)
+            _last_email_state = new_state
         
         return changed
     except Exception as e:
@@ -618,6 +945,65 @@ def should_send_email(action: str, period: str) -> bool:
         return False
 
 
+def run_cache_key(btc_price: float, market_cap: float) -> List[float]:
+    """Bucket live inputs ($100 BTC, $1M market cap) so tiny ticks still count as unchanged"""
+    return [round(btc_price, -2), round(market_cap, -6)]
+
+
+def load_run_cache() -> Optional[Dict[str, Any]]:
+    """
+    Return the last run's cached state if it is younger than RUN_CACHE_TTL.
+    Callers still compare its "key" against run_cache_key() for the live inputs.
+    """
+    if RUN_CACHE_TTL <= 0 or not os.path.exists(RUN_CACHE_PATH):
+        return None
+
+    try:
+        with open(RUN_CACHE_PATH, "rb") as f:
+            cached = _loads(f.read())
+        if time.time() - cached.get("ts", 0) >= RUN_CACHE_TTL:
+            return None
+        return cached
+    except Exception as e:
+        print(f"⚠️  Run cache unreadable, ignoring: {e}")
+        return None
+
+
+def save_run_cache(btc_price: float, market_cap: float, data: Dict[str, Any]) -> None:
+    """Persist the inputs key and the fetched Yahoo/SEC data so the next run can skip those fetches"""
+    if RUN_CACHE_TTL <= 0:
+        return
+
+    try:
+        os.makedirs(os.path.dirname(RUN_CACHE_PATH), exist_ok=True)
+        payload = _dumps({
+            "key": run_cache_key(btc_price, market_cap),
+            "data": data,
+            "ts": time.time()
+        }, default=lambda x: x.item())  # numpy scalars from the yfinance frames
+        with open(RUN_CACHE_PATH, "wb") as f:
+            f.write(payload)
+    except Exception as e:
+        print(f"⚠️  Could not save run cache: {e}")
+
+
+def save_report_json(metrics: Dict[str, Any], eval_out: Dict[str, Any], decision: Dict[str, str]) -> None:
+    """Write the run's metrics/signals/decision to REPORT_JSON_PATH (orjson when available)"""
+    if not REPORT_JSON_PATH:
+        return
+
+    structured = {"metrics": metrics, "eval": eval_out, "decision": decision, "timestamp": time.time()}
+    try:
+        if orjson is not None:
+            payload = orjson.dumps(structured, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY, default=str)
+        else:
+            payload = json.dumps(structured, indent=2, default=str).encode()
+        with open(REPORT_JSON_PATH, "wb") as f:
+            f.write(payload)
+    except Exception as e:
+        print(f"⚠️  Could not write {REPORT_JSON_PATH}: {e}")
+
+
 def build_manual_core_ttm(data: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Build manual core TTM from hard-coded dataset.
@@ -656,7 +1042,7 @@ def apply_policy(row: dict) -> dict:
     period = row["period"]
     rv = float(row["reval_used"])
     policy = (row.get("policy") or "").lower()
-    post = period >= "2025-01-01" or policy == "post-asu"
+    post = period >= ASU_CUTOFF or policy == "post-asu"
     
     if not post:  # pre-ASU
         rv = min(rv, 0.0)
@@ -673,7 +1059,7 @@ def apply_policy(row: dict) -> dict:
 def build_core_rows_from_overrides(rows):
     """Build core earnings rows from manual overrides with policy enforcement"""
     out = []
-    for r in sorted(rows, key=lambda x: x["period"]):
+    for r in sorted(rows, key=itemgetter("period")):
         r = apply_policy(r)
         ni = float(r["ni"])
         rv = float(r["reval_used"])
@@ -777,6 +1163,7 @@ def params_quality_ok(p: dict) -> bool:
 REVAL_INCLUDE = ("gain", "loss", "gainloss", "changeinfairvalue", "fairvaluechange")
 REVAL_ASSET = ("digital", "crypto", "cryptocurrency", "bitcoin", "btc")
 REVAL_EXCLUDE = ("cost", "current", "noncurrent", "purchase", "mining")  # NOTE: removed "fairvalue"
+ASU_CUTOFF = "2025-01-01"  # first post-ASU 2023-08 period end (adjust if MARA early-adopted)
 
 def looks_like_reval_pnl(concept_name: str) -> bool:
     """Check if concept looks like P&L revaluation, not balance sheet levels"""
@@ -784,47 +1171,41 @@ def looks_like_reval_pnl(concept_name: str) -> bool:
     has_signal = any(k in n for k in REVAL_INCLUDE) or ("fairvalue" in n and "change" in n)
     return has_signal and any(k in n for k in REVAL_ASSET) and not any(k in n for k in REVAL_EXCLUDE)
 
-def sec_reval_series_strict(n: int = 12) -> dict:
-    """Return {end: {'val': float, 'filed': str, 'src': 'prefix:Concept'}} for P&L-style digital-asset reval only."""
+@lru_cache(maxsize=None)
+def _sec_reval_series_strict(n: int) -> dict:
+    """Uncopied, cached-per-n scan behind sec_reval_series_strict; raises on failure so errors aren't cached"""
+    cik = get_cik_from_ticker("MARA")
+    if not cik:
+        raise LookupError("no CIK for MARA")
     out = {}
+    facts = _get_companyfacts(cik).get("facts", {}) or {}
+    for tax, concepts in facts.items():
+        for concept, payload in concepts.items():
+            if not looks_like_reval_pnl(concept):
+                continue
+            usd = (payload.get("units") or {}).get("USD", [])
+            q = [x for x in usd if (x.get("fp") in _QUARTERLY_FP or x.get("qtrs")==1 or x.get("dur")=="P3M")]
+            for x in q:
+                end, val, filed = x.get("end"), x.get("val"), x.get("filed")
+                if end and val is not None:
+                    prev = out.get(end)
+                    if (prev is None) or (filed and prev["filed"] < filed):
+                        out[end] = {"val": float(val), "filed": filed or "", "src": f"{tax}:{concept}"}
+    # keep only post-ASU periods (fiscal years beginning 2025+)
+    ends_sorted = sorted(out)
+    post_asu_ends = ends_sorted[bisect_left(ends_sorted, ASU_CUTOFF):]
+    # keep recent n post-ASU periods (empty when none were found)
+    return {k: out[k] for k in post_asu_ends[-n:]}
+
+
+def sec_reval_series_strict(n: int = 12) -> dict:
+    """Return {end: {'val': float, 'filed': str, 'src': 'prefix:Concept'}} for P&L-style digital-asset reval only.
+    The scan runs once per n; each caller gets its own copy to modify freely."""
     try:
-        cik = get_cik_from_ticker("MARA")
-        if not cik: return out
-        import time, requests
-        time.sleep(0.1)
-        url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
-        headers = {'User-Agent': 'MARA-Valuation-Tool/1.0 (educational-use@example.com)'}
-        r = requests.get(url, headers=headers, timeout=15)
-        r.raise_for_status()
-        facts = r.json().get("facts", {}) or {}
-        for tax, concepts in facts.items():
-            for concept, payload in concepts.items():
-                if not looks_like_reval_pnl(concept):
-                    continue
-                usd = (payload.get("units") or {}).get("USD", [])
-                q = [x for x in usd if (x.get("fp") in {"Q1","Q2","Q3","Q4"} or x.get("qtrs")==1 or x.get("dur")=="P3M")]
-                for x in q:
-                    end, val, filed = x.get("end"), x.get("val"), x.get("filed")
-                    if end and val is not None:
-                        prev = out.get(end)
-                        if (prev is None) or (filed and prev["filed"] < filed):
-                            out[end] = {"val": float(val), "filed": filed or "", "src": f"{tax}:{concept}"}
-        # keep only post-ASU periods (fiscal years beginning 2025+)
-        post_asu_ends = [k for k in out.keys() if post_asu(k)]
-        if post_asu_ends:
-            # keep recent n post-ASU periods
-            ends = sorted(post_asu_ends)[-n:]
-            return {k: out[k] for k in ends}
-        else:
-            return {}  # no post-ASU periods found
+        return {end: dict(fact) for end, fact in _sec_reval_series_strict(n).items()}
     except Exception as e:
         print(f"⚠️ reval strict scan failed: {e}")
-        return out
-
-
-def post_asu(end_date: str) -> bool:
-    """Check if period is post-ASU 2023-08 (fiscal years beginning 2025+)"""
-    return end_date >= "2025-01-01"  # adjust if MARA early-adopted
+        return {}
 
 
 def sec_fv_series(n: int = 12) -> dict:
@@ -877,30 +1258,19 @@ def fetch_sec_latest_custom_reval(n: int = 1):
     try:
         cik = get_cik_from_ticker("MARA")
         if not cik: return []
-        import time, requests
-        time.sleep(0.1)
-        url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
-        headers = {'User-Agent': 'MARA-Valuation-Tool/1.0 (educational-use@example.com)'}
-        r = requests.get(url, headers=headers, timeout=15)
-        r.raise_for_status()
-        data = r.json()
-        facts = data.get("facts", {}) or {}
+        facts = _get_companyfacts(cik).get("facts", {}) or {}
 
-        # Enhanced search keys for digital/crypto/bitcoin
-        KEYS = ("digitalasset", "digitalassets", "crypto", "cryptocurrency", "bitcoin", "btc")
-        
         # search keys for digital/crypto/bitcoin
         hits = []
         for taxonomy, concepts in facts.items():
-            if taxonomy.lower() == "dei":
+            if taxonomy.lower() in _SKIP_TAXONOMIES:
                 continue
             for concept, payload in concepts.items():
                 # Clean concept name for better matching
-                name = concept.lower().replace("_", "")
-                if any(k in name for k in KEYS):
+                if _DIGITAL_ASSET_RE.search(concept.replace("_", "")):
                     usd = (payload.get("units") or {}).get("USD", [])
                     # quarterly-ish filter
-                    q = [x for x in usd if (x.get("fp") in {"Q1","Q2","Q3","Q4"} or x.get("qtrs")==1 or x.get("dur")=="P3M")]
+                    q = [x for x in usd if (x.get("fp") in _QUARTERLY_FP or x.get("qtrs")==1 or x.get("dur")=="P3M")]
                     for x in q:
                         val = x.get("val")
                         end = x.get("end")
@@ -922,7 +1292,8 @@ def fetch_sec_latest_custom_reval(n: int = 1):
                     print(f"   Found {len(hits)} reval concepts (none aligned with NI)")
                     # Force recent data by filtering out ancient entries
                     recent_cutoff = "2023-01-01"
-                    recent_hits = [h for h in hits if h["end"] >= recent_cutoff]
+                    hits.sort(key=itemgetter("end"))
+                    recent_hits = hits[bisect_left([h["end"] for h in hits], recent_cutoff):]
                     if recent_hits:
                         hits = recent_hits
                         print(f"   Filtered to {len(hits)} recent concepts (since {recent_cutoff})")
@@ -931,8 +1302,7 @@ def fetch_sec_latest_custom_reval(n: int = 1):
             except Exception as e:
                 print(f"   ⚠️  Could not check NI alignment: {e}")
         
-        hits.sort(key=lambda z: z["end"], reverse=True)
-        return hits[:n]
+        return heapq.nlargest(n, hits, key=itemgetter("end"))
     except Exception as e:
         print(f"⚠️ SEC custom reval scan failed: {e}")
         return []
@@ -946,45 +1316,19 @@ def fetch_sec_quarterly_values(concept: str, n: int = 12) -> dict:
             print(f"   ⚠️  Could not find CIK for MARA")
             return {}
         
-        url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik.zfill(10)}.json"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        r = requests.get(url, headers=headers, timeout=15)
-        r.raise_for_status()
-        facts = r.json().get("facts", {}) or {}
-        
-        # Look for the concept in us-gaap taxonomy
-        us_gaap_facts = facts.get("us-gaap", {}).get(concept, {}).get("units", {}).get("USD", [])
+        # One cached companyfacts download serves every concept requested this run
+        facts = _get_companyfacts(cik).get("facts", {}) or {}
+        us_gaap_facts = _usd(facts.get("us-gaap", {}), concept) or []
         
         print(f"   🔍 Debug: {concept} - Raw facts count: {len(us_gaap_facts)}")
         
-        quarterly_data = {}
-        quarterly_count = 0
-        for fact in us_gaap_facts:
-            # Check if it's quarterly data
-            if (fact.get("fp") in ["Q1", "Q2", "Q3", "Q4"] or 
-                fact.get("qtrs") == 1 or 
-                fact.get("dur") == "P3M"):
-                
-                quarterly_count += 1
-                end_date = fact.get("end")
-                if end_date:
-                    # If multiple values exist for same end date, pick the one with latest filed date
-                    if end_date not in quarterly_data or fact.get("filed", "") > quarterly_data[end_date].get("filed", ""):
-                        quarterly_data[end_date] = {
-                            "val": fact.get("val"),
-                            "filed": fact.get("filed")
-                        }
+        quarterly_data, quarterly_count = _quarterly_by_end(us_gaap_facts)
         
         print(f"   🔍 Debug: {concept} - Quarterly facts count: {quarterly_count}")
         print(f"   🔍 Debug: {concept} - Unique end dates: {len(quarterly_data)}")
         print(f"   🔍 Debug: {concept} - All end dates: {sorted(quarterly_data.keys())}")
         
-        # Sort by end date and take the latest n (most recent first)
-        sorted_ends = sorted(quarterly_data.keys(), reverse=True)[:n]
-        result = {end: quarterly_data[end] for end in sorted_ends}
+        result = _latest_by_end(quarterly_data, n)
         print(f"   🔍 Debug: {concept} - Returning {len(result)} periods: {sorted(result.keys())}")
         return result
         
@@ -993,6 +1337,27 @@ def fetch_sec_quarterly_values(concept: str, n: int = 12) -> dict:
         return {}
 
 
+def fetch_pl_reval_post_asu(n: int = 12) -> Dict[str, Dict[str, Any]]:
+    """Post-ASU P&L reval by end date: {end: {'val', 'src'}} across REVAL_CONCEPTS"""
+    pl_reval = {}
+    for concept in REVAL_CONCEPTS:
+        data = fetch_sec_quarterly_values(concept, n)
+        for end, fact in data.items():  # most recent first
+            if end < ASU_CUTOFF:  # Only post-ASU; everything after this is older
+                break
+            pl_reval[end] = {"val": fact["val"], "src": concept}
+    return pl_reval
+
+
+def fetch_core_series() -> Tuple[dict, dict, dict, dict, dict]:
+    """NI, interest, crypto FV, crypto cost and post-ASU P&L reval series used by the 4Q core build"""
+    ni = fetch_sec_quarterly_values("NetIncomeLoss", 30)  # Increased more to get to 2025-06-30
+    ie = fetch_sec_quarterly_values("InterestExpense", 30)  # Increased to match
+    fv = fetch_sec_quarterly_values("CryptoAssetFairValue", 12)
+    ct = fetch_sec_quarterly_values("CryptoAssetCost", 12)
+    return ni, ie, fv, ct, fetch_pl_reval_post_asu(12)
+
+
 def build_quarterly_history() -> List[Dict[str, Any]]:
     """
     Build a 4-quarter normalized history table from SEC data.
@@ -1002,53 +1367,45 @@ def build_quarterly_history() -> List[Dict[str, Any]]:
     ni = fetch_sec_quarterly_values("NetIncomeLoss", n=8)
     ie = fetch_sec_quarterly_values("InterestExpense", n=8)
     
-    # Try different reval concepts
-    reval = None
-    for concept in ("NetRealizedAndUnrealizedGainLossOnInvestments", 
-                   "UnrealizedGainLossOnInvestments", 
-                   "RealizedGainLossOnInvestments"):
-        reval = fetch_sec_quarterly_values(concept, n=8)
-        if reval:
-            break
+    # Pick the first standard reval concept present (single companyfacts pass)
+    reval = {}
+    cik = get_cik_from_ticker("MARA")
+    if cik:
+        _, reval = _first_available_concept(cik, REVAL_CONCEPTS, n=8)
     
-    # If no standard reval, try custom digital asset concepts
+    # If no standard reval, try custom digital asset concepts (same end-keyed shape)
     if not reval:
         custom = fetch_sec_latest_custom_reval(8)
-        reval = [{"end": x["end"], "val": x["val"]} for x in custom]
+        reval = {x["end"]: {"val": x["val"], "filed": None} for x in custom}
     
     if not (ni and ie and reval):
         return []
     
-    # Index by end date for easy lookup
-    def index_by_end(xs):
-        return {x["end"]: x["val"] for x in xs if x.get("end") and x.get("val") is not None}
-    
-    i_ni = index_by_end(ni)
-    i_ie = index_by_end(ie)
-    i_rev = index_by_end(reval)
+    import pandas as pd  # ships with yfinance; imported here to keep module import light
     
-    # Find common periods
-    common_periods = sorted(set(i_ni.keys()) & set(i_ie.keys()) & set(i_rev.keys()))[-4:]
+    # Inner-join on end date (dropna), keep the last 4 common periods, then vector arithmetic
+    df = pd.DataFrame({
+        "reported_ni": _vals_by_end(ni),
+        "reval": _vals_by_end(reval),
+        "interest": _vals_by_end(ie),
+    }).dropna().sort_index().tail(4)
+    df["adj_ni"] = df["reported_ni"] - df["reval"]
+    df["adj_ni_no_debt"] = df["adj_ni"] + df["interest"]
     
-    # Build rows
-    rows = []
-    for end in common_periods:
-        rni = i_ni[end]
-        rev = i_rev[end]
-        inx = i_ie[end]
-        adj = rni - rev
-        adj_no_debt = adj + inx
-        
-        rows.append({
-            "period": end,
-            "reported_ni": rni,
-            "reval": rev,
-            "interest": inx,
-            "adj_ni": adj,
-            "adj_ni_no_debt": adj_no_debt
-        })
-    
-    return rows
+    return [{"period": end, **row} for end, row in df.to_dict(orient="index").items()]
+
+
+def _core_earnings(ni_vals: List[float], reval_vals: List[float], ie_vals: List[float]) -> List[float]:
+    """Core = NI - Reval + Interest per period (one vector op when numpy is available)"""
+    try:
+        import numpy as np  # optional, and only needed here; imported here to keep module import light
+    except ImportError:
+        return [ni - rv + ie for ni, rv, ie in zip(ni_vals, reval_vals, ie_vals)]
+    count = len(ni_vals)
+    ni_arr = np.fromiter(ni_vals, dtype=np.float64, count=count)
+    reval_arr = np.fromiter(reval_vals, dtype=np.float64, count=count)
+    ie_arr = np.fromiter(ie_vals, dtype=np.float64, count=count)
+    return (ni_arr - reval_arr + ie_arr).tolist()
 
 
 def build_aligned_sec_series() -> List[Dict[str, Any]]:
@@ -1060,51 +1417,45 @@ def build_aligned_sec_series() -> List[Dict[str, Any]]:
     ni = fetch_sec_quarterly_values("NetIncomeLoss", n=8)
     ie = fetch_sec_quarterly_values("InterestExpense", n=8)
     
-    # Try different reval concepts
-    reval = None
-    for concept in ("NetRealizedAndUnrealizedGainLossOnInvestments", 
-                   "UnrealizedGainLossOnInvestments", 
-                   "RealizedGainLossOnInvestments"):
-        reval = fetch_sec_quarterly_values(concept, n=8)
-        if reval:
-            break
+    # Pick the first standard reval concept present (single companyfacts pass)
+    reval = {}
+    cik = get_cik_from_ticker("MARA")
+    if cik:
+        _, reval = _first_available_concept(cik, REVAL_CONCEPTS, n=8)
     
-    # If no standard reval, try custom digital asset concepts
+    # If no standard reval, try custom digital asset concepts (same end-keyed shape)
     if not reval:
         custom = fetch_sec_latest_custom_reval(8)
-        reval = [{"end": x["end"], "val": x["val"]} for x in custom]
+        reval = {x["end"]: {"val": x["val"], "filed": None} for x in custom}
     
     if not (ni and ie and reval):
         return []
     
     # Index by end date for easy lookup
-    def index_by_end(xs):
-        return {x["end"]: x["val"] for x in xs if x.get("end") and x.get("val") is not None}
-    
-    i_ni = index_by_end(ni)
-    i_ie = index_by_end(ie)
-    i_rev = index_by_end(reval)
+    i_ni = _vals_by_end(ni)
+    i_ie = _vals_by_end(ie)
+    i_rev = _vals_by_end(reval)
     
     # Find common periods (all three concepts must have data)
     common_periods = sorted(set(i_ni.keys()) & set(i_ie.keys()) & set(i_rev.keys()))
     
-    # Build aligned rows
-    rows = []
-    for end in common_periods:
-        ni_val = i_ni[end]
-        reval_val = i_rev[end]
-        interest_val = i_ie[end]
-        
-        # Core earnings = NI - Reval + Interest
-        core_q = ni_val - reval_val + interest_val
-        
-        rows.append({
+    # Build aligned rows: Core earnings = NI - Reval + Interest
+    ni_vals = [i_ni[end] for end in common_periods]
+    reval_vals = [i_rev[end] for end in common_periods]
+    ie_vals = [i_ie[end] for end in common_periods]
+    core_vals = _core_earnings(ni_vals, reval_vals, ie_vals)
+    
+    rows = [
+        {
             "period": end,
             "net_income": ni_val,
             "digital_asset_reval": reval_val,
             "interest_expense": interest_val,
             "core_earnings": core_q
-        })
+        }
+        for end, ni_val, reval_val, interest_val, core_q
+        in zip(common_periods, ni_vals, reval_vals, ie_vals, core_vals)
+    ]
     
     return rows
 
@@ -1135,25 +1486,74 @@ def dqc_log_line(metrics: dict):
         pass
 
 
-def main():
+def submit_fundamentals(pool: ThreadPoolExecutor) -> Dict[str, Future]:
+    """Start the Yahoo + SEC fetches main() needs beyond BTC price and market cap"""
+    return {
+        "financials": pool.submit(fetch_mara_financials),
+        "total_debt": pool.submit(get_total_debt),
+        "sec_data": pool.submit(fetch_sec_financials),
+    }
+
+
+def prompt_if_interactive(value: Optional[float], label: str) -> Optional[float]:
+    """Return value, or ask for it on a TTY; non-interactive runs (cron/CI) get None instead of blocking"""
+    if value is not None:
+        return value
+    if not sys.stdin.isatty():
+        return None
+    try:
+        return float(input(f"Enter {label} manually: "))
+    except (ValueError, EOFError):
+        return None
+
+
+def main(btc_price_override: Optional[float] = None, market_cap_override: Optional[float] = None):
     print("=== MARA Miner Valuation Tool (Quick-Start) ===")
     print()
     
-    btc_price = get_btc_price()
-    market_cap = get_mara_market_cap()
+    # Independent network fetches run concurrently; wall time ≈ slowest call, not the sum.
+    # The heavy Yahoo/SEC fetches wait only if fresh cached data might make them unnecessary.
+    pool = ThreadPoolExecutor(max_workers=5)
+    f_btc = None if btc_price_override is not None else pool.submit(get_btc_price)
+    f_mc = None if market_cap_override is not None else pool.submit(get_mara_market_cap)
+    cached = load_run_cache()
+    fundamentals = None if cached else submit_fundamentals(pool)
+
+    btc_price = prompt_if_interactive(f_btc.result() if f_btc else btc_price_override, "BTC price")
+    market_cap = prompt_if_interactive(f_mc.result() if f_mc else market_cap_override, "MARA market cap")
     print()
 
+    if btc_price is None or market_cap is None:
+        pool.shutdown(wait=False, cancel_futures=True)
+        print("❌ Missing BTC price or MARA market cap — pass --btc-price / --market-cap for non-interactive runs")
+        return
+
     print(f"💰 BTC Price: ${btc_price:,.0f}")
     print(f"📊 MARA Market Cap: ${market_cap:,.0f}")
     print()
 
+    # Nothing moved since the last run? Reuse its Yahoo/SEC data instead of refetching it;
+    # the analysis, report, DQC log and email steps below still run either way
+    if cached and "data" in cached and cached.get("key") == run_cache_key(btc_price, market_cap):
+        pool.shutdown()
+        age = time.time() - cached["ts"]
+        print(f"♻️  Inputs unchanged since last run ({age:.0f}s ago) — reusing cached Yahoo/SEC data (RUN_CACHE_TTL=0 to force refresh)")
+        print()
+        fetched = cached["data"]
+    else:
+        if fundamentals is None:
+            fundamentals = submit_fundamentals(pool)
+        pool.shutdown(wait=False)  # submitted futures still complete
+        fetched = {name: future.result() for name, future in fundamentals.items()}
+        save_run_cache(btc_price, market_cap, fetched)
+
     btc_units = 50639
     treasury_value = btc_units * btc_price
     print(f"🏦 Treasury (BTC holdings x price): ${treasury_value:,.0f}")
     print()
 
     # Get real cash data from financials
-    financials = fetch_mara_financials()
+    financials = fetched["financials"]
     if financials and financials['cash'] is not None:
         cash = financials['cash']
         print(f"💵 Cash: ${cash:,.0f}")
@@ -1161,7 +1561,7 @@ def main():
         print("💵 Cash: Not found")
         cash = 0  # Use 0 for NAV calculation if not found
     
-    total_debt = get_total_debt()
+    total_debt = fetched["total_debt"]
     if total_debt is None:
         print("💳 Total Debt: Not found (using $0)")
         total_debt = 0
@@ -1177,8 +1577,7 @@ def main():
 
     # Fetch real financial data
     print("[B] Normalized History")
-    financials = fetch_mara_financials()
-    sec_data = fetch_sec_financials()
+    sec_data = fetched["sec_data"]
     
     if financials and sec_data:
         print(f"📊 {financials['quarter']} | Reported NI: ${financials['reported_ni']:,.0f}")
@@ -1264,10 +1663,13 @@ def main():
         metrics["interest_period"] = sec_data.get("interest_period")
 
     # === Build 4Q core using spec-compliant backcasting ===
-    ni = fetch_sec_quarterly_values("NetIncomeLoss", 30)  # Increased more to get to 2025-06-30
-    ie = fetch_sec_quarterly_values("InterestExpense", 30)  # Increased to match
-    fv = fetch_sec_quarterly_values("CryptoAssetFairValue", 12)
-    ct = fetch_sec_quarterly_values("CryptoAssetCost", 12)
+    # Series come along with sec_data; only refetch if the SEC pass failed
+    if sec_data and "ni_series" in sec_data:
+        ni, ie = sec_data["ni_series"], sec_data["ie_series"]
+        fv, ct = sec_data["fv_series"], sec_data["ct_series"]
+        pl_reval = sec_data["pl_reval_series"]
+    else:
+        ni, ie, fv, ct, pl_reval = fetch_core_series()
     
     # Debug: Let's see the raw data we're getting
     print(f"   🔍 Debug: Raw NI data count: {len(ni)}")
@@ -1275,16 +1677,6 @@ def main():
     print(f"   🔍 Debug: Raw FV data count: {len(fv)}")
     print(f"   🔍 Debug: Raw Cost data count: {len(ct)}")
     
-    # Optional: scan for P&L reval concepts (post-2025)
-    pl_reval = {}
-    for concept in ["NetRealizedAndUnrealizedGainLossOnInvestments", 
-                   "UnrealizedGainLossOnInvestments", 
-                   "RealizedGainLossOnInvestments"]:
-        data = fetch_sec_quarterly_values(concept, 12)
-        for end, fact in data.items():
-            if end >= "2025-01-01":  # Only post-ASU
-                pl_reval[end] = {"val": fact["val"], "src": concept}
-    
     # Debug: Print what we're getting
     print(f"   📊 Data found: NI={len(ni)}, IE={len(ni)}, FV={len(fv)}, Cost={len(ct)}, P&L_Reval={len(pl_reval)}")
     if ni:
@@ -1338,9 +1730,11 @@ def main():
     # Strategy 1: Use fully aligned periods if we have enough
     if len(fully_aligned_ends) >= 2:  # Need at least 2 for reval calculation
         print(f"   🔍 Using fully aligned periods for reval calculation")
+        asu_idx = bisect_left(fully_aligned_ends, ASU_CUTOFF)  # ends are sorted, so one split point
         for i in range(1, len(fully_aligned_ends)):  # Need prior end for Δ
             curr = fully_aligned_ends[i]
             prev = fully_aligned_ends[i-1]
+            is_post_asu = i >= asu_idx
             
             print(f"   🔍 Debug: Processing {curr} vs {prev}")
             
@@ -1351,13 +1745,13 @@ def main():
             rv_used = None
             rv_src = None
             
-            if curr >= "2025-01-01" and curr in pl_reval:
+            if is_post_asu and curr in pl_reval:
                 # Post-ASU: use P&L actual if available
                 rv_used = pl_reval[curr]["val"]
                 rv_src = f"P&L: {pl_reval[curr]['src']}"
             else:
                 # Use estimated reval
-                if curr >= "2025-01-01":
+                if is_post_asu:
                     # Post-ASU: use full estimated reval
                     rv_used = est_reval
                     rv_src = "Est: ΔFV−ΔCost"
@@ -1414,7 +1808,7 @@ def main():
         print(f"   📊 Policy enforcement: Pre-ASU quarters only remove downside, Post-ASU remove full reval")
     
     # Sort by period and take last 4 for TTM
-    rows = sorted(rows, key=lambda r: r["period"])
+    rows.sort(key=itemgetter("period"))
     last4 = rows[-4:] if len(rows) >= 4 else []
     
     # Save to metrics
@@ -1583,6 +1977,7 @@ def main():
 
     # Build and print the explainer + TL;DR
     report = build_report(metrics, eval_out, decision, sec_data, proj_rows)
+    save_report_json(metrics, eval_out, decision)
     print("\n" + "="*60)
     print(report)
     
@@ -1591,16 +1986,8 @@ def main():
     print("📧 EMAIL PREVIEW (what would be sent)")
     print("="*60)
     
-    # Enhanced subject with key metrics (ACMPE-FWD only if enabled and credible)
-    acmpe = metrics.get('acmpe_ttm')
-    acmpe_fwd = metrics.get('acmpe_fwd')
-    acmpe_str = f"ACMPE:{acmpe:.1f}x" if acmpe else "ACMPE:N/A"
-    
-    if acmpe_fwd is not None:
-        email_subject = f"MARA Signal — {decision['action']} | mNAV:{mnav:.2f}x | {acmpe_str} | ACMPE-FWD:{acmpe_fwd:.1f}x"
-    else:
-        email_subject = f"MARA Signal — {decision['action']} | mNAV:{mnav:.2f}x | {acmpe_str}"
-    
+    # Same subject is used for the preview and the actual send
+    email_subject = _format_subject(decision['action'], mnav, metrics.get('acmpe_ttm'), metrics.get('acmpe_fwd'))
     print(f"SUBJECT: {email_subject}")
     print("-" * 60)
     print("RECIPIENTS: " + (os.getenv("ALERT_RECIPIENTS", "Not configured") or "Not configured"))
@@ -1610,23 +1997,13 @@ def main():
     print("="*60)
 
     # Optional: email if user configured recipients and state changed
-    recipients_env = os.getenv("ALERT_RECIPIENTS", "")
-    recipients = [e.strip() for e in recipients_env.split(",") if e.strip()]
+    recipients = _RECIP_RE.findall(os.getenv("ALERT_RECIPIENTS", ""))
     if recipients:
         # Get current period for state tracking
         current_period = metrics.get('reported_ni_period') or "unknown"
         
         if should_send_email(decision['action'], current_period):
-            # Enhanced subject with key metrics (ACMPE-FWD only if enabled and credible)
-            acmpe = metrics.get('acmpe_ttm')
-            acmpe_fwd = metrics.get('acmpe_fwd')
-            acmpe_str = f"ACMPE:{acmpe:.1f}x" if acmpe else "ACMPE:N/A"
-            
-            if acmpe_fwd is not None:
-                subject = f"MARA Signal — {decision['action']} | mNAV:{mnav:.2f}x | {acmpe_str} | ACMPE-FWD:{acmpe_fwd:.1f}x"
-            else:
-                subject = f"MARA Signal — {decision['action']} | mNAV:{mnav:.2f}x | {acmpe_str}"
-            send_email_report(report, subject, recipients)
+            send_email_report(report, email_subject, recipients)
         else:
             print("📧 Email skipped — no change in action or period")
     
@@ -1671,4 +2048,8 @@ def main():
     dqc_log_line(metrics)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="MARA miner valuation explainer")
+    parser.add_argument("--btc-price", type=float, default=None, help="Use this BTC price instead of fetching it")
+    parser.add_argument("--market-cap", type=float, default=None, help="Use this MARA market cap instead of fetching it")
+    args = parser.parse_args()
+    main(args.btc_price, args.market_cap)
@@ -5,9 +5,31 @@ Just mNAV and ACMPE-TTM. That's it.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import yfinance as yf
+import io
 import json
 import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+try:
+    import orjson  # optional: faster JSON parsing for the adjustments file
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np  # optional: vectorizes the per-quarter core arithmetic
+except ImportError:
+    np = None
 
 # Environment variables
 USE_ADJUSTMENTS = os.getenv("USE_ADJUSTMENTS", "1") == "1"
@@ -15,6 +37,26 @@ ADD_BACK_SBC = os.getenv("ADD_BACK_SBC", "0") == "1"
 OPS_ONLY = os.getenv("OPS_ONLY", "1") == "1"
 ADJ_PATH = os.getenv("ADJ_PATH", "overrides/adjustments.json")
 FAIR_PE = float(os.getenv("FAIR_PE", "8"))  # pick 5/8/11 per scenario when printing
+HTTP_CACHE_TTL = int(os.getenv("HTTP_CACHE_TTL", "300"))  # seconds; 0 disables the on-disk HTTP cache
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", ".cache/http_cache")
+
+# Adjustment validation and category buckets
+_REQUIRED_ADJ_FIELDS = frozenset({"period", "label", "reason", "category"})
+_BTC_REJECT_RE = re.compile(r"btc|crypto|digital[ _]asset|revaluation|fair value", re.IGNORECASE)
+_VALID_CATEGORIES = frozenset({"financing", "transaction", "restructuring", "litigation", "asset_sale", "future", "growth", "preop", "debt", "other"})
+_EXPANSION_CATS = frozenset({"future", "growth", "preop"})
+_DEBT_CATS = frozenset({"financing", "debt"})
+
+# Repeat runs within the TTL read the CoinGecko price from SQLite instead of the network (needs requests-cache)
+_HTTP_CACHED = requests_cache is not None and HTTP_CACHE_TTL > 0
+if _HTTP_CACHED:
+    _SESSION = requests_cache.CachedSession(HTTP_CACHE_PATH, expire_after=HTTP_CACHE_TTL)
+else:
+    _SESSION = requests.Session()
+# Keep-alive pool plus backoff on CoinGecko throttling / transient 5xx
+_SESSION.mount("https://", HTTPAdapter(
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+))
 
 # Manual quarterly data for ACMPE calculation
 MARA_QUARTERS = [
@@ -48,14 +90,41 @@ MARA_QUARTERS = [
     }
 ]
 
-def apply_policy(period: str, reval_used: float) -> float:
+def _policy_mask(quarters):
+    """Post-ASU flag and printable policy label per quarter"""
+    post_asu = [q["period"] >= "2025-01-01" for q in quarters]
+    return post_asu, ["post-ASU" if b else "pre-ASU" for b in post_asu]
+
+# The quarter list is static, so resolve its pre/post-ASU split once
+_POST_ASU, _POLICY_LABELS = _policy_mask(MARA_QUARTERS)
+
+def apply_policy(post_asu: bool, reval_used: float) -> float:
     """Enforce pre/post-ASU revaluation rules"""
-    return reval_used if period >= "2025-01-01" else min(reval_used, 0.0)
+    return reval_used if post_asu else min(reval_used, 0.0)
+
+def _core_vectors(quarters, post_asu):
+    """Policy-enforced reval, core (= NI - Reval + Int) per quarter, and the core total"""
+    if np is None:
+        reval = [apply_policy(b, q["reval_used"]) for q, b in zip(quarters, post_asu)]
+        core = [q["ni"] - rv + q["interest"] for q, rv in zip(quarters, reval)]
+        return reval, core, sum(core)
+    count = len(quarters)
+    ni = np.fromiter((q["ni"] for q in quarters), dtype=np.float64, count=count)
+    reval = np.fromiter((q["reval_used"] for q in quarters), dtype=np.float64, count=count)
+    interest = np.fromiter((q["interest"] for q in quarters), dtype=np.float64, count=count)
+    reval_eff = np.where(np.asarray(post_asu, dtype=bool), reval, np.minimum(reval, 0.0))
+    core = ni - reval_eff + interest
+    return reval_eff.tolist(), core.tolist(), float(core.sum())
 
-def get_cash_and_debt():
+def _mara():
+    """New yfinance Ticker for MARA; Tickers aren't thread-safe, so each worker builds its own"""
+    # yfinance manages its own (curl_cffi) session and rejects a requests/requests-cache one
+    return yf.Ticker("MARA")
+
+def get_cash_and_debt(mara=None):
     """Get live cash and debt from Yahoo Finance"""
     try:
-        mara = yf.Ticker("MARA")
+        mara = mara or _mara()
         bs = mara.quarterly_balance_sheet
         
         if bs is not None and not bs.empty:
@@ -75,30 +144,35 @@ def get_cash_and_debt():
         print(f"❌ Error fetching cash/debt: {e}")
         return None, None
 
+@lru_cache(maxsize=4)
+def _load_json(path, mtime):
+    """Parse a JSON file once per (path, mtime); orjson when installed, else stdlib json"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
 def load_adjustments(path=ADJ_PATH):
     """Load and validate adjustments from JSON file"""
     if not os.path.exists(path):
         return {}
     
     try:
-        with open(path) as f:
-            rows = json.load(f)
+        rows = _load_json(path, os.path.getmtime(path))
         
         out = {}
         for r in rows:
             # Validate required fields
-            if not all(k in r for k in ["period", "label", "reason", "category"]):
+            if not _REQUIRED_ADJ_FIELDS.issubset(r):
                 print(f"⚠️  Skipping invalid adjustment: missing required fields")
                 continue
             
             # Reject BTC revaluation adjustments (double-counting protection)
-            if any(word in r["label"].lower() for word in ["btc", "crypto", "digital asset", "revaluation", "fair value"]):
+            if _BTC_REJECT_RE.search(r["label"]):
                 print(f"⚠️  Skipping BTC revaluation adjustment: {r['label']}")
                 continue
             
             # Validate category
-            valid_categories = ["financing", "transaction", "restructuring", "litigation", "asset_sale", "future", "growth", "preop", "debt", "other"]
-            if r["category"] not in valid_categories:
+            if r["category"] not in _VALID_CATEGORIES:
                 print(f"⚠️  Skipping adjustment with invalid category '{r['category']}': {r['label']}")
                 continue
             
@@ -108,7 +182,9 @@ def load_adjustments(path=ADJ_PATH):
                 "label": r["label"],
                 "impact": v,
                 "reason": r["reason"],
-                "category": r["category"]
+                "category": r["category"],
+                "is_expansion": r["category"] in _EXPANSION_CATS,
+                "is_debt_fin": r["category"] in _DEBT_CATS
             })
         return out
     except Exception as e:
@@ -118,23 +194,36 @@ def load_adjustments(path=ADJ_PATH):
 def get_btc_price():
     """Get current BTC price from CoinGecko"""
     try:
-        response = requests.get("https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=usd")
+        response = _SESSION.get("https://api.coingecko.com/api/v3/simple/price",
+                                params={"ids": "bitcoin", "vs_currencies": "usd"}, timeout=5)
+        response.raise_for_status()
         return response.json()["bitcoin"]["usd"]
-    except:
+    except (requests.RequestException, KeyError, ValueError) as e:
+        print(f"❌ Error fetching BTC price: {e}")
         return None
 
-def get_mara_market_cap():
+def get_mara_market_cap(mara=None):
     """Get MARA market cap from Yahoo Finance"""
     try:
         print("🔍 Fetching MARA data from Yahoo Finance...")
-        mara = yf.Ticker("MARA")
+        mara = mara or _mara()
+        
+        # fast_info is a single lightweight quote call; try it before the big info payload
+        print("   Trying fast info...")
+        try:
+            market_cap = getattr(mara.fast_info, 'market_cap', None)
+        except Exception as e:
+            print(f"   ⚠️ Fast info failed: {e}")
+            market_cap = None
+        if market_cap:
+            print(f"✅ Got market cap from fast info: ${market_cap:,.0f}")
+            return market_cap
         
-        # Try to get basic info first
+        # Fall back to the full info blob
         print("   Getting basic info...")
         info = mara.info
         print(f"   Info keys available: {list(info.keys())[:10]}...")
         
-        # Try multiple ways to get market cap
         market_cap = info.get("marketCap")
         if market_cap and market_cap > 0:
             print(f"✅ Got market cap from info: ${market_cap:,.0f}")
@@ -152,13 +241,6 @@ def get_mara_market_cap():
             print(f"✅ Calculated market cap: ${calculated_mc:,.0f}")
             return calculated_mc
         
-        # Try fast info as last resort
-        print("   Trying fast info...")
-        fast_info = mara.fast_info
-        if hasattr(fast_info, 'market_cap') and fast_info.market_cap:
-            print(f"✅ Got market cap from fast info: ${fast_info.market_cap:,.0f}")
-            return fast_info.market_cap
-        
         print("❌ All methods failed to get market cap")
         return None
         
@@ -171,20 +253,23 @@ def calculate_acmpe_ttm(quarters, market_cap, treasury_value, cash, total_debt):
     # Load adjustments if enabled
     adjustments = load_adjustments() if USE_ADJUSTMENTS else {}
     
-    # Calculate core earnings for each quarter with policy enforcement
+    # Core earnings for every quarter in one pass, with pre/post-ASU policy enforced
+    post_asu, policy_labels = (_POST_ASU, _POLICY_LABELS) if quarters is MARA_QUARTERS else _policy_mask(quarters)
+    reval_eff, core_vals, core_ttm = _core_vectors(quarters, post_asu)
+    
     quarters_core = []
-    for q in quarters:
-        # Enforce pre/post-ASU policy
-        rv = apply_policy(q["period"], q["reval_used"])
-        core_q = q["ni"] - rv + q["interest"]
-        
-        # Apply adjustments if any exist for this period
+    for q, rv, core_q, policy in zip(quarters, reval_eff, core_vals, policy_labels):
+        # Apply adjustments if any exist for this period; one pass buckets the total,
+        # expansion-only add-backs (future/growth/preop) and debt/financing items
         period_adjustments = adjustments.get(q["period"], [])
-        adj_sum = sum(a["impact"] for a in period_adjustments)
+        adj_sum = fut_adj = debt_fin_adj = 0.0
+        for a in period_adjustments:
+            adj_sum += a["impact"]
+            if a["is_expansion"]:
+                fut_adj += a["impact"]
+            elif a["is_debt_fin"]:
+                debt_fin_adj += a["impact"]
         core_adj = core_q + adj_sum
-        
-        # Expansion-only add-backs per quarter (future/growth/preop)
-        fut_adj = sum(a["impact"] for a in period_adjustments if a.get("category") in {"future", "growth", "preop"})
         core_ops_only = core_q + fut_adj
         
         quarters_core.append({
@@ -198,11 +283,12 @@ def calculate_acmpe_ttm(quarters, market_cap, treasury_value, cash, total_debt):
             "adjustments": period_adjustments,
             "adj_sum": adj_sum,
             "fut_adj_sum": fut_adj,
-            "policy": "post-ASU" if q["period"] >= "2025-01-01" else "pre-ASU"
+            "debt_fin_adj": debt_fin_adj,
+            "clean_ops": core_ops_only + debt_fin_adj,
+            "policy": policy
         })
     
-    # Calculate Core TTM (unadjusted, adjusted, and ops-only)
-    core_ttm = sum(q["core"] for q in quarters_core)
+    # Calculate Core TTM (adjusted and ops-only; unadjusted comes from _core_vectors)
     core_ttm_adj = sum(q["core_adj"] for q in quarters_core)
     core_ttm_ops = sum(q["core_ops_only"] for q in quarters_core)
     
@@ -216,6 +302,8 @@ def calculate_acmpe_ttm(quarters, market_cap, treasury_value, cash, total_debt):
     
     return quarters_core, core_ttm, core_ttm_adj, core_ttm_ops, rbv, acmpe_ttm, acmpe_ttm_adj, acmpe_ttm_ops
 
+_PE_SCENARIO_LABELS = {5: "Value PE (5×)", 8: "Market PE (8×)", 11: "Growth PE (11×)"}
+
 def calculate_prime_mnav(treasury_value, cash, debt, core_ttm, pe_scenarios=[5, 8, 11]):
     """
     Calculate PRIME mNAV (Peyton's Risk-Integrated Miner mNAV) using PE-based fair value
@@ -231,26 +319,22 @@ def calculate_prime_mnav(treasury_value, cash, debt, core_ttm, pe_scenarios=[5,
     # Calculate cash-debt adjustment (always the same)
     cash_debt_adjustment = (cash - debt) / treasury_value
     
-    for pe in pe_scenarios:
-        if pe == 5:
-            scenario = "Value PE (5×)"
-        elif pe == 8:
-            scenario = "Market PE (8×)" 
-        elif pe == 11:
-            scenario = "Growth PE (11×)"
-        else:
-            scenario = f"{pe}x"
-        
-        # PE × Core TTM = Business Value
-        business_value = pe * core_ttm
-        
-        # Business Value ÷ Treasury Value = PE adjustment
-        pe_adjustment = business_value / treasury_value
-        
-        # PRIME mNAV = 1.0 + cash-debt adjustment + PE adjustment
-        prime_mnav = 1.0 + cash_debt_adjustment + pe_adjustment
-        
+    # PE × Core TTM = Business Value; Business Value ÷ Treasury Value = PE adjustment;
+    # PRIME mNAV = 1.0 + cash-debt adjustment + PE adjustment (one broadcast over all PEs with numpy)
+    if np is not None:
+        business = np.asarray(pe_scenarios, dtype=np.float64) * core_ttm
+        pe_adj = business / treasury_value
+        prime = 1.0 + cash_debt_adjustment + pe_adj
+        business_values, pe_adjustments, prime_mnavs = business.tolist(), pe_adj.tolist(), prime.tolist()
+    else:
+        business_values = [pe * core_ttm for pe in pe_scenarios]
+        pe_adjustments = [bv / treasury_value for bv in business_values]
+        prime_mnavs = [1.0 + cash_debt_adjustment + adj for adj in pe_adjustments]
+    
+    for pe, business_value, pe_adjustment, prime_mnav in zip(pe_scenarios, business_values, pe_adjustments, prime_mnavs):
+        scenario = _PE_SCENARIO_LABELS.get(pe, f"{pe}x")
         prime_values[scenario] = {
+            'pe': pe,
             'prime_mnav': prime_mnav,
             'cash_debt_adjustment': cash_debt_adjustment,
             'pe_adjustment': pe_adjustment,
@@ -267,23 +351,33 @@ def main():
     print(f"🔧 SBC Add-back: {'ON' if ADD_BACK_SBC else 'OFF'}")
     print()
     
+    # Fire off the independent network fetches together (each Yahoo call gets its own Ticker)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        btc_future = pool.submit(get_btc_price)
+        mc_future = pool.submit(get_mara_market_cap)
+        cd_future = pool.submit(get_cash_and_debt)
+        btc_price = btc_future.result()
+        mara_mc = mc_future.result()
+        cash, total_debt = cd_future.result()
+    
     # Get basic data
-    btc_price = get_btc_price()
     if not btc_price:
         print("❌ Failed to get BTC price")
         return
     
-    mara_mc = get_mara_market_cap()
     if not mara_mc:
         print("❌ Failed to get MARA market cap")
         return
     
     # Get live cash and debt
-    cash, total_debt = get_cash_and_debt()
     if cash is None or total_debt is None:
         print("❌ Failed to get live cash and debt data")
         return
     
+    # Build the report in memory and write it out in one go
+    buf = io.StringIO()
+    emit = partial(print, file=buf)
+    
     # Assume BTC holdings (you can update this)
     btc_holdings = 50639
     treasury = btc_holdings * btc_price
@@ -292,142 +386,143 @@ def main():
     nav = treasury + cash - total_debt
     mnav = mara_mc / treasury
     
-    print(f"💰 BTC Price: ${btc_price:,.0f}")
-    print(f"📊 MARA Market Cap: ${mara_mc:,.0f}")
-    print(f"🏦 Treasury (BTC × price): ${treasury:,.0f}")
-    print(f"💵 Cash: ${cash:,.0f} (live from Yahoo Finance)")
-    print(f"💳 Total Debt: ${total_debt:,.0f} (live from Yahoo Finance)")
-    print(f"📈 NAV (treasury + cash - debt): ${nav:,.0f} (calculated with live data)")
+    emit(f"💰 BTC Price: ${btc_price:,.0f}")
+    emit(f"📊 MARA Market Cap: ${mara_mc:,.0f}")
+    emit(f"🏦 Treasury (BTC × price): ${treasury:,.0f}")
+    emit(f"💵 Cash: ${cash:,.0f} (live from Yahoo Finance)")
+    emit(f"💳 Total Debt: ${total_debt:,.0f} (live from Yahoo Finance)")
+    emit(f"📈 NAV (treasury + cash - debt): ${nav:,.0f} (calculated with live data)")
     
     # Calculate ACMPE-TTM from quarterly data
-    print(f"\n🔍 Calculating ACMPE-TTM from quarterly data...")
+    emit(f"\n🔍 Calculating ACMPE-TTM from quarterly data...")
     quarters_core, core_ttm, core_ttm_adj, core_ttm_ops, rbv, acmpe_ttm, acmpe_ttm_adj, acmpe_ttm_ops = calculate_acmpe_ttm(MARA_QUARTERS, mara_mc, treasury, cash, total_debt)
     
-    print(f"\n📊 Last 4 Quarters (Allworth Core Mining P/E Calculation)")
-    print("   Pre-ASU: Only removes impairment losses (GAAP fair value accounting rules)")
-    print("   Post-ASU: Removes full fair value changes (FASB ASU 2023-08 implementation)")
-    print("   AdjustedCore adds back non-core items (see row notes).")
-    print("   Period       NI           RevalUsed     Interest     Allworth Core Mining P/E Core (= NI - Reval + Int)   +Expansion   Allworth Core Mining P/E Core(Ops-Only)   Policy")
-    print("   " + "-" * 150)
+    emit(f"\n📊 Last 4 Quarters (Allworth Core Mining P/E Calculation)")
+    emit("   Pre-ASU: Only removes impairment losses (GAAP fair value accounting rules)")
+    emit("   Post-ASU: Removes full fair value changes (FASB ASU 2023-08 implementation)")
+    emit("   AdjustedCore adds back non-core items (see row notes).")
+    emit("   Period       NI           RevalUsed     Interest     Allworth Core Mining P/E Core (= NI - Reval + Int)   +Expansion   Allworth Core Mining P/E Core(Ops-Only)   Policy")
+    emit("   " + "-" * 150)
     
     for q in quarters_core:
-        print(f"   {q['period']}  {q['ni']:>12,.0f}  {q['reval_used']:>12,.0f}  {q['interest']:>10,.0f}  {q['core']:>18,.0f}  {q['fut_adj_sum']:>10,.0f}  {q['core_ops_only']:>15,.0f}   {q['policy']}")
+        emit(f"   {q['period']}  {q['ni']:>12,.0f}  {q['reval_used']:>12,.0f}  {q['interest']:>10,.0f}  {q['core']:>18,.0f}  {q['fut_adj_sum']:>10,.0f}  {q['core_ops_only']:>15,.0f}   {q['policy']}")
         
         # Show adjustments if any exist
         if q['adjustments']:
             for adj in q['adjustments']:
                 impact_str = "+" if adj['impact'] > 0 else ""
-                print(f"      {impact_str}{adj['impact']:,.0f} {adj['label']} ({adj['category']}: {adj['reason']})")
+                emit(f"      {impact_str}{adj['impact']:,.0f} {adj['label']} ({adj['category']}: {adj['reason']})")
     
     # Add second table for clean operations view
-    print(f"\n📊 Clean Operations View (Existing Sites Only)")
-    print("   Removes: Expansion spending, debt-related items, financing noise")
-    print("   Shows: What MARA would earn just running existing operations")
-    print("   Period       Allworth Core Mining P/E Core        +Expansion   +Debt/Fin   Clean Ops   Policy")
-    print("   " + "-" * 120)
+    emit(f"\n📊 Clean Operations View (Existing Sites Only)")
+    emit("   Removes: Expansion spending, debt-related items, financing noise")
+    emit("   Shows: What MARA would earn just running existing operations")
+    emit("   Period       Allworth Core Mining P/E Core        +Expansion   +Debt/Fin   Clean Ops   Policy")
+    emit("   " + "-" * 120)
     
+    clean_ops_ttm = 0.0
     for q in quarters_core:
-        # Calculate clean operations by adding back expansion and debt/financing items
-        debt_fin_adj = sum(a["impact"] for a in q["adjustments"] if a.get("category") in {"financing", "debt"})
-        clean_ops = q["core"] + q["fut_adj_sum"] + debt_fin_adj
+        # Clean operations = core + expansion and debt/financing add-backs (bucketed in calculate_acmpe_ttm)
+        debt_fin_adj = q["debt_fin_adj"]
+        clean_ops = q["clean_ops"]
+        clean_ops_ttm += clean_ops
         
-        print(f"   {q['period']}  {q['core']:>12,.0f}  {q['fut_adj_sum']:>10,.0f}  {debt_fin_adj:>10,.0f}  {clean_ops:>10,.0f}   {q['policy']}")
+        emit(f"   {q['period']}  {q['core']:>12,.0f}  {q['fut_adj_sum']:>10,.0f}  {debt_fin_adj:>10,.0f}  {clean_ops:>10,.0f}   {q['policy']}")
         
         # Show what was added back for clean operations
         if q['fut_adj_sum'] != 0 or debt_fin_adj != 0:
             if q['fut_adj_sum'] != 0:
-                print(f"      +{q['fut_adj_sum']:,.0f} expansion costs added back")
+                emit(f"      +{q['fut_adj_sum']:,.0f} expansion costs added back")
             if debt_fin_adj != 0:
-                print(f"      +{debt_fin_adj:,.0f} debt/financing items added back")
+                emit(f"      +{debt_fin_adj:,.0f} debt/financing items added back")
     
-    # Calculate clean operations TTM
-    clean_ops_ttm = sum(q["core"] + q["fut_adj_sum"] + sum(a["impact"] for a in q["adjustments"] if a.get("category") in {"financing", "debt"}) for q in quarters_core)
+    # Clean operations TTM was accumulated in the table loop above
     acmpe_clean_ops = (rbv / clean_ops_ttm) if (rbv > 0 and clean_ops_ttm > 0) else None
     
-    print(f"\n📊 ACMPE-TTM Calculation:")
+    emit(f"\n📊 ACMPE-TTM Calculation:")
     # Determine which view to headline based on OPS_ONLY flag
     use_core = core_ttm_ops if OPS_ONLY else core_ttm
     use_acmpe = acmpe_ttm_ops if OPS_ONLY else acmpe_ttm
     use_label = "Ops-Only" if OPS_ONLY else "Unadjusted"
     
-    print(f"   Allworth Core Mining P/E Core TTM ({use_label}): ${use_core:,.0f}")
-    print(f"   Allworth Core Mining P/E Core TTM-Adj: ${core_ttm_adj:,.0f} (with non-core adjustments)")
-    print(f"   Allworth Core Mining P/E Core TTM (Clean Ops): ${clean_ops_ttm:,.0f} (existing sites only)")
-    print(f"   RBV: ${rbv:,.0f} (Market Cap - NAV = business value excluding BTC)")
+    emit(f"   Allworth Core Mining P/E Core TTM ({use_label}): ${use_core:,.0f}")
+    emit(f"   Allworth Core Mining P/E Core TTM-Adj: ${core_ttm_adj:,.0f} (with non-core adjustments)")
+    emit(f"   Allworth Core Mining P/E Core TTM (Clean Ops): ${clean_ops_ttm:,.0f} (existing sites only)")
+    emit(f"   RBV: ${rbv:,.0f} (Market Cap - NAV = business value excluding BTC)")
     
     if use_acmpe:
-        print(f"   Allworth Core Mining P/E (ACMPE-TTM) ({use_label}): {use_acmpe:.1f}x (RBV ÷ Core TTM)")
+        emit(f"   Allworth Core Mining P/E (ACMPE-TTM) ({use_label}): {use_acmpe:.1f}x (RBV ÷ Core TTM)")
     else:
-        print(f"   Allworth Core Mining P/E (ACMPE-TTM) ({use_label}): N/A (negative core or RBV)")
+        emit(f"   Allworth Core Mining P/E (ACMPE-TTM) ({use_label}): N/A (negative core or RBV)")
     
     if acmpe_ttm_adj:
-        print(f"   Allworth Core Mining P/E (ACMPE-TTM-Adj): {acmpe_ttm_adj:.1f}x (RBV ÷ Adjusted Core TTM)")
+        emit(f"   Allworth Core Mining P/E (ACMPE-TTM-Adj): {acmpe_ttm_adj:.1f}x (RBV ÷ Adjusted Core TTM)")
     else:
-        print(f"   Allworth Core Mining P/E (ACMPE-TTM-Adj): N/A (negative adjusted core or RBV)")
+        emit(f"   Allworth Core Mining P/E (ACMPE-TTM-Adj): N/A (negative adjusted core or RBV)")
     
     if acmpe_clean_ops:
-        print(f"   Allworth Core Mining P/E (ACMPE-TTM Clean Ops): {acmpe_clean_ops:.1f}x (RBV ÷ Clean Operations TTM)")
+        emit(f"   Allworth Core Mining P/E (ACMPE-TTM Clean Ops): {acmpe_clean_ops:.1f}x (RBV ÷ Clean Operations TTM)")
     else:
-        print(f"   Allworth Core Mining P/E (ACMPE-TTM Clean Ops): N/A (negative clean ops or RBV)")
+        emit(f"   Allworth Core Mining P/E (ACMPE-TTM Clean Ops): N/A (negative clean ops or RBV)")
     
-    print(f"\n📊 Comparison Views:")
-    print(f"   Allworth Core Mining P/E Core TTM (Unadjusted): ${core_ttm:,.0f} | Allworth Core Mining P/E Core TTM (Ops-Only): ${core_ttm_ops:,.0f} | Allworth Core Mining P/E Core TTM (Clean Ops): ${clean_ops_ttm:,.0f}")
+    emit(f"\n📊 Comparison Views:")
+    emit(f"   Allworth Core Mining P/E Core TTM (Unadjusted): ${core_ttm:,.0f} | Allworth Core Mining P/E Core TTM (Ops-Only): ${core_ttm_ops:,.0f} | Allworth Core Mining P/E Core TTM (Clean Ops): ${clean_ops_ttm:,.0f}")
     
-    print(f"\n📝 Note: Decision gate uses {use_label} ACMPE-TTM. Adjusted multiple shown for context only.")
-    print(f"📝 Policy Enforcement: Pre-ASU quarters enforce impairment-only removal; Post-ASU quarters apply full fair value accounting.")
-    print(f"📝 Ops-Only view adds back expansion expenses (pre-operating, acquisition, commissioning) and leaves financing and BTC revaluation rules unchanged.")
-    print(f"📝 Clean Operations view removes ALL non-operational items to show existing site performance only.")
+    emit(f"\n📝 Note: Decision gate uses {use_label} ACMPE-TTM. Adjusted multiple shown for context only.")
+    emit(f"📝 Policy Enforcement: Pre-ASU quarters enforce impairment-only removal; Post-ASU quarters apply full fair value accounting.")
+    emit(f"📝 Ops-Only view adds back expansion expenses (pre-operating, acquisition, commissioning) and leaves financing and BTC revaluation rules unchanged.")
+    emit(f"📝 Clean Operations view removes ALL non-operational items to show existing site performance only.")
     
     # Calculate PRIME mNAV
     prime_values = calculate_prime_mnav(treasury, cash, total_debt, clean_ops_ttm)
+    bear = prime_values['Value PE (5×)']['prime_mnav']
+    neutral = prime_values['Market PE (8×)']['prime_mnav']
+    bull = prime_values['Growth PE (11×)']['prime_mnav']
+    prime_lo, prime_hi = min(bear, neutral, bull), max(bear, neutral, bull)
     
-    print(f"\n📊 PRIME mNAV Scenarios (Peyton's Risk-Integrated Miner mNAV):")
-    print("   📊 Business Value Floor: OFF (negative operations reduce fair value)")
-    print(f"   🎯 Default PE: {FAIR_PE}x (set FAIR_PE env var to change)")
+    emit(f"\n📊 PRIME mNAV Scenarios (Peyton's Risk-Integrated Miner mNAV):")
+    emit("   📊 Business Value Floor: OFF (negative operations reduce fair value)")
+    emit(f"   🎯 Default PE: {FAIR_PE}x (set FAIR_PE env var to change)")
     
     for scenario, data in prime_values.items():
-        print(f"   {scenario}: {data['prime_mnav']:.3f}x (Fair Value ÷ Treasury)")
+        emit(f"   {scenario}: {data['prime_mnav']:.3f}x (Fair Value ÷ Treasury)")
     
-    print(f"\n🧮 PRIME mNAV Calculation Breakdown:")
+    emit(f"\n🧮 PRIME mNAV Calculation Breakdown:")
     cash_debt_adj = prime_values['Market PE (8×)']['cash_debt_adjustment']  # Same for all scenarios
-    print(f"   Base: 1.0x")
-    print(f"   Cash-Debt Adjustment: +{cash_debt_adj:+.3f}x (${cash:,.0f} - ${total_debt:,.0f}) ÷ ${treasury:,.0f}")
+    emit(f"   Base: 1.0x")
+    emit(f"   Cash-Debt Adjustment: +{cash_debt_adj:+.3f}x (${cash:,.0f} - ${total_debt:,.0f}) ÷ ${treasury:,.0f}")
     balance_sheet_mnav = 1.0 + cash_debt_adj
-    print(f"   Balance-sheet mNAV (neutral ops) = 1 + (Cash−Debt)/Treasury = {balance_sheet_mnav:.3f}×")
-    print()
+    emit(f"   Balance-sheet mNAV (neutral ops) = 1 + (Cash−Debt)/Treasury = {balance_sheet_mnav:.3f}×")
+    emit()
     
     for scenario, data in prime_values.items():
-        if scenario == "Value PE (5×)":
-            pe = 5
-        elif scenario == "Market PE (8×)":
-            pe = 8
-        else:
-            pe = 11
-        
-        print(f"   {scenario} ({pe}x PE): Core TTM ${core_ttm_ops:,.0f} × {pe}x = ${data['business_value']:,.0f} business value")
-        print(f"           PE Adjustment: {data['pe_adjustment']:+.3f}x")
-        print(f"           PRIME mNAV = 1.0 + {cash_debt_adj:+.3f} + {data['pe_adjustment']:+.3f} = {data['prime_mnav']:.3f}x")
-        print()
+        pe = data['pe']
+        emit(f"   {scenario} ({pe}x PE): Core TTM ${core_ttm_ops:,.0f} × {pe}x = ${data['business_value']:,.0f} business value")
+        emit(f"           PE Adjustment: {data['pe_adjustment']:+.3f}x")
+        emit(f"           PRIME mNAV = 1.0 + {cash_debt_adj:+.3f} + {data['pe_adjustment']:+.3f} = {data['prime_mnav']:.3f}x")
+        emit()
 
-    print(f"\n🎯 mNAV: {mnav:.2f}x (Market Cap ÷ Treasury)")
+    emit(f"\n🎯 mNAV: {mnav:.2f}x (Market Cap ÷ Treasury)")
     
-    print(f"\n🎯 Summary: mNAV: {mnav:.2f}x | PRIME mNAV: Value PE (5×) {prime_values['Value PE (5×)']['prime_mnav']:.3f}x | Market PE (8×) {prime_values['Market PE (8×)']['prime_mnav']:.3f}x | Growth PE (11×) {prime_values['Growth PE (11×)']['prime_mnav']:.3f}x | Allworth Core Mining P/E Core TTM (Clean Ops): ${clean_ops_ttm:,.0f}")
+    emit(f"\n🎯 Summary: mNAV: {mnav:.2f}x | PRIME mNAV: Value PE (5×) {bear:.3f}x | Market PE (8×) {neutral:.3f}x | Growth PE (11×) {bull:.3f}x | Allworth Core Mining P/E Core TTM (Clean Ops): ${clean_ops_ttm:,.0f}")
     
     # Add interpretation
-    print(f"\n📊 PRIME mNAV Interpretation:")
-    print(f"   Value PE (5x): Operations valued conservatively - Fair Value: {prime_values['Value PE (5×)']['prime_mnav']:.3f}x")
-    print(f"   Market PE (8x): Operations valued at market average - Fair Value: {prime_values['Market PE (8×)']['prime_mnav']:.3f}x") 
-    print(f"   Growth PE (11x): Operations valued optimistically - Fair Value: {prime_values['Growth PE (11×)']['prime_mnav']:.3f}x")
-    
-    if mnav < min(prime_values['Value PE (5×)']['prime_mnav'], prime_values['Market PE (8×)']['prime_mnav'], prime_values['Growth PE (11×)']['prime_mnav']):
-        print(f"   🚀 Current mNAV ({mnav:.2f}x) < All PRIME mNAV scenarios - Potentially undervalued even in bear case")
-    elif mnav > max(prime_values['Value PE (5×)']['prime_mnav'], prime_values['Market PE (8×)']['prime_mnav'], prime_values['Growth PE (11×)']['prime_mnav']):
-        print(f"   ⚠️  Current mNAV ({mnav:.2f}x) > All PRIME mNAV scenarios - Potentially overvalued even in bull case")
+    emit(f"\n📊 PRIME mNAV Interpretation:")
+    emit(f"   Value PE (5x): Operations valued conservatively - Fair Value: {bear:.3f}x")
+    emit(f"   Market PE (8x): Operations valued at market average - Fair Value: {neutral:.3f}x") 
+    emit(f"   Growth PE (11x): Operations valued optimistically - Fair Value: {bull:.3f}x")
+    
+    if mnav < prime_lo:
+        emit(f"   🚀 Current mNAV ({mnav:.2f}x) < All PRIME mNAV scenarios - Potentially undervalued even in bear case")
+    elif mnav > prime_hi:
+        emit(f"   ⚠️  Current mNAV ({mnav:.2f}x) > All PRIME mNAV scenarios - Potentially overvalued even in bull case")
     else:
-        print(f"   ➖ Current mNAV ({mnav:.2f}x) falls within PRIME mNAV range - Reasonably valued")
+        emit(f"   ➖ Current mNAV ({mnav:.2f}x) falls within PRIME mNAV range - Reasonably valued")
     
     # Add TL;DR line
-    print(f"\n🎯 TL;DR: PRIME mNAV (PE-adjusted): {prime_values['Value PE (5×)']['prime_mnav']:.3f}x / {prime_values['Market PE (8×)']['prime_mnav']:.3f}x / {prime_values['Growth PE (11×)']['prime_mnav']:.3f}x (5×/8×/11×). Current mNAV {mnav:.2f}x is {'above' if mnav > max(prime_values['Value PE (5×)']['prime_mnav'], prime_values['Market PE (8×)']['prime_mnav'], prime_values['Growth PE (11×)']['prime_mnav']) else 'below'} fair range ⇒ {'overvalued' if mnav > max(prime_values['Value PE (5×)']['prime_mnav'], prime_values['Market PE (8×)']['prime_mnav'], prime_values['Growth PE (11×)']['prime_mnav']) else 'undervalued'} on ops-PE basis.")
+    emit(f"\n🎯 TL;DR: PRIME mNAV (PE-adjusted): {bear:.3f}x / {neutral:.3f}x / {bull:.3f}x (5×/8×/11×). Current mNAV {mnav:.2f}x is {'above' if mnav > prime_hi else 'below'} fair range ⇒ {'overvalued' if mnav > prime_hi else 'undervalued'} on ops-PE basis.")
+
+    sys.stdout.write(buf.getvalue())
 
 if __name__ == "__main__":
     main()
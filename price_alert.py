@@ -2,130 +2,214 @@
 
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import atexit
+import json
 import os
-import smtplib
-from email.message import EmailMessage
-from dotenv import load_dotenv
-
-
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import argparse
 
-parser = argparse.ArgumentParser(description="BTC Strike Alert CLI")
-
-parser.add_argument("--send", action="store_true", help="Send email alert")
-parser.add_argument("--raw", action="store_true", help="Print full Strike API JSON")
-
-args = parser.parse_args()
+try:
+    import orjson  # optional: faster JSON parsing than the stdlib json behind response.json()
+except ImportError:
+    orjson = None
 
 
 
 
 
-# Load .env variables
-load_dotenv()
+# Load .env variables; anything already exported (systemd/Docker/CI) takes precedence
+from dotenv import load_dotenv
+load_dotenv(override=False)
 
 # Pull secrets
 STRIKE_API_KEY = os.getenv("STRIKE_API_KEY")
 EMAIL_ADDRESS = os.getenv("EMAIL_ADDRESS")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
-RECIPIENTS = os.getenv("RECIPIENTS").split(",")
+RECIPIENTS = os.getenv("RECIPIENTS", "").split(",")
+
+# One keep-alive session for Strike calls (reuses the TLS connection, auth header set once)
+SESSION = requests.Session()
+SESSION.headers.update({"Authorization": f"Bearer {STRIKE_API_KEY}"})
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=10,
+    # connect/read timeouts bound each try; transient 429/5xx get a short backoff and retry
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"]),
+))
+
+# Price barely moves between back-to-back cron runs; reuse the last quote for this many seconds
+PRICE_CACHE_TTL = int(os.getenv("PRICE_CACHE_TTL", "60"))
+PRICE_CACHE_PATH = os.path.expanduser(os.getenv("PRICE_CACHE_PATH", "~/.btc_price_cache.json"))
 
 
 
 
 # Get BTC price from Strike API
-def get_btc_price():
+def get_btc_price(raw=False):
     url = "https://api.strike.me/v1/rates/ticker" # Adjust if needed
-    headers = {"Authorization": f"Bearer {STRIKE_API_KEY}"}
-    response = requests.get(url, headers=headers)
-    data = response.json()
-    if args.raw:
+    response = SESSION.get(url, timeout=(3, 5))
+    data = orjson.loads(response.content) if orjson is not None else response.json()
+    if raw:
         print("🔍 Full JSON:", data)
 
 
-  # Find BTC → USD pair
-    for item in data:
-        if item["sourceCurrency"] == "BTC" and item["targetCurrency"] == "USD":
-            return float(item["amount"])
-
-    raise ValueError("BTC→USD rate not found")
-
-    print("🔍 JSON from Strike:", data)  # <— Add this to inspect
-    
-    return float(data["rate"])  # Temporary: we’ll fix this next
-
-     
+    # Find BTC → USD pair (stops at the first match)
+    try:
+        return float(next(item["amount"] for item in data
+                          if item["sourceCurrency"] == "BTC" and item["targetCurrency"] == "USD"))
+    except StopIteration:
+        raise ValueError("BTC→USD rate not found") from None
+
+
+# Strike price with a small on-disk TTL cache ({ts, price})
+def _cached_price(ttl=PRICE_CACHE_TTL):
+    try:
+        with open(PRICE_CACHE_PATH) as f:
+            cache = json.load(f)
+        if time.time() - cache["ts"] < ttl:
+            return float(cache["price"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass  # missing/corrupt cache: fall through to a live fetch
+
+    price = get_btc_price()
+    try:
+        tmp = PRICE_CACHE_PATH + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"ts": time.time(), "price": price}, f)
+        os.replace(tmp, PRICE_CACHE_PATH)  # atomic: a concurrent run never reads a half-written file
+    except OSError as e:
+        print(f"⚠️ Could not write price cache: {e}")
+    return price
+
+
+# One logged-in SMTP connection per process, reused by every send_email call
+_SMTP = None
+_SMTP_SENT = 0  # messages sent on the current connection
+SMTP_MAX_PER_CONNECTION = 500  # reconnect after this many to stay under provider limits
+
+def _smtp_singleton():
+    global _SMTP, _SMTP_SENT
+    # Only pay for the mail stack when actually sending
+    import smtplib
+
+    if _SMTP is not None and _SMTP_SENT >= SMTP_MAX_PER_CONNECTION:
+        _close_smtp()
+
+    if _SMTP is not None:
+        try:
+            _SMTP.noop()  # health check: the server may have dropped an idle connection
+            return _SMTP
+        except (smtplib.SMTPException, OSError):
+            _SMTP = None
+
+    # Only publish the connection once it's logged in, so a failed login isn't reused
+    server = smtplib.SMTP_SSL("smtp.gmail.com", 465)
+    try:
+        server.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
+    except BaseException:
+        try:
+            server.close()
+        except Exception:
+            pass
+        raise
+    _SMTP = server
+    _SMTP_SENT = 0
+    return _SMTP
+
+
+def _close_smtp():
+    global _SMTP
+    if _SMTP is not None:
+        try:
+            _SMTP.quit()
+        except Exception:
+            pass  # already gone; nothing to clean up
+        _SMTP = None
+
+atexit.register(_close_smtp)
 
 
 # Email sending function
 def send_email(subject, body, to_emails):
+    """Send one message per recipient; returns how many were delivered"""
+    global _SMTP_SENT
+    import smtplib
+    from email.message import EmailMessage
+
     msg = EmailMessage()
     msg["Subject"] = subject
     msg["From"] = EMAIL_ADDRESS
-    msg["To"] = ",  ".join(to_emails)
     msg.set_content(body)
 
-    with smtplib.SMTP_SSL("smtp.gmail.com", 465) as smtp:
-        smtp.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
-        smtp.send_message(msg)
-
-
-price = get_btc_price()
-print(f"Live BTC price from Strike API: ${price:,.2f}")
-
-threshold = 100_000
-
-
-
-
+    # One envelope per recipient over the shared connection: recipients don't see each
+    # other and each delivery succeeds or fails on its own
+    sent = 0
+    for recipient in (r.strip() for r in to_emails):
+        if not recipient:
+            continue
+        del msg["To"]
+        msg["To"] = recipient
+        try:
+            _smtp_singleton().send_message(msg, to_addrs=[recipient])
+        except (smtplib.SMTPException, OSError) as e:
+            print(f"⚠️ Could not send to {recipient}: {e}")
+            continue
+        _SMTP_SENT += 1
+        sent += 1
+    return sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BTC Strike Alert CLI")
+
+    parser.add_argument("--send", action="store_true", help="Send email alert")
+    parser.add_argument("--raw", action="store_true", help="Print full Strike API JSON")
+
+    args = parser.parse_args()
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        # --raw wants to see the live payload, so it always bypasses the cache
+        price_future = pool.submit(get_btc_price, raw=True) if args.raw else pool.submit(_cached_price)
+        # Log in to SMTP while the price is in flight
+        smtp_future = pool.submit(_smtp_singleton) if args.send else None
+        price = price_future.result()
+        if smtp_future is not None:
+            try:
+                smtp_future.result()
+            except Exception as e:
+                # send_email opens a fresh connection and reports per recipient if it fails again
+                print(f"⚠️ SMTP warm-up failed, retrying on send: {e}")
+    print(f"Live BTC price from Strike API: ${price:,.2f}")
+
+    threshold = 100_000
+
+    # TEMPORARY: fake price for testing while waiting on API key
+    # price = 99_950
+    # print(f"Live BTC price from Strike: ${price:,.2f}")
+
+    if price < threshold:
+        message = f"BTC dropped below ${threshold:,.2f}. Current price: ${price:,.2f}! Time to stack more sats?"
+    else:
+        message = f"BTC is steady at ${price:,.2f}. Probably should still stack more sats!"
 
-# TEMPORARY: fake price for testing while waiting on API key
-# price = 99_950
-# print(f"Live BTC price from Strike: ${price:,.2f}")
-
-
-
-# threshold = 100_000
-
-# price = get_btc_price()
-# print(f"Current BTC price: ${price}")
-
-
-
-
-
-
-
-
-
-
-'''if price < threshold:
-    message = f"BTC dropped below ${threshold:,.2f}. Current price: ${price:,.2f}! Time to stack more sats?"
-    print(message)
-    send_email("BTC Price Alert", message, RECIPIENTS)
-else:
-    message = f"BTC is steady at ${price:,.2f}. Probably should still stack more sats!"
     print(message)
-    send_email("BTC Update", message, RECIPIENTS)
-'''
-
-
-
-
 
-if price < threshold:
-    message = f"BTC dropped below ${threshold:,.2f}. Current price: ${price:,.2f}! Time to stack more sats?"
-else:
-    message = f"BTC is steady at ${price:,.2f}. Probably should still stack more sats!"
+    if args.send:
+        sent = send_email("BTC Price Alert", message, RECIPIENTS)
+        if sent:
+            print(f"📨 Email alert sent to {sent} recipient(s).")
+        else:
+            print("⚠️ No email sent (no recipients, or every delivery failed)")
+    else:
+        print("Private Terminal Response. No Email Sent")
 
-print(message)
 
-if args.send:
-    send_email("BTC Price Alert", message, RECIPIENTS)
-    print("📨 Email alert sent.")
-else:
-    print("Private Terminal Response. No Email Sent")
+if __name__ == "__main__":
+    main()
 
 
 
@@ -0,0 +1,76 @@
+import unittest
+from unittest import mock
+
+import mara_val
+
+try:
+    import pandas  # noqa: F401  build_quarterly_history's DataFrame path needs it
+except ImportError:
+    pandas = None
+
+
+def _series(values):
+    """End-keyed series in fetch_sec_quarterly_values' shape, most recent first"""
+    return {end: {"val": val, "filed": "2025-08-01"} for end, val in sorted(values.items(), reverse=True)}
+
+
+@unittest.skipIf(pandas is None, "pandas not installed")
+class BuildQuarterlyHistoryTest(unittest.TestCase):
+    def run_history(self, ni, ie, reval):
+        def fake_quarterly_values(concept, n=12):
+            return {"NetIncomeLoss": ni, "InterestExpense": ie}[concept]
+
+        with mock.patch.object(mara_val, "fetch_sec_quarterly_values", side_effect=fake_quarterly_values), \
+             mock.patch.object(mara_val, "get_cik_from_ticker", return_value="0001507605"), \
+             mock.patch.object(mara_val, "_first_available_concept", return_value=("UnrealizedGainLossOnInvestments", reval)):
+            return mara_val.build_quarterly_history()
+
+    def test_inner_join_keeps_last_four_common_periods(self):
+        ni = _series({
+            "2024-03-31": 100.0, "2024-06-30": 200.0, "2024-09-30": 300.0,
+            "2024-12-31": 400.0, "2025-03-31": 500.0, "2025-06-30": 600.0,
+        })
+        # 2024-09-30 has no interest and 2025-06-30 has no reval: both drop out of the join
+        ie = _series({
+            "2024-03-31": 1.0, "2024-06-30": 2.0, "2024-12-31": 4.0,
+            "2025-03-31": 5.0, "2025-06-30": 6.0,
+        })
+        reval = _series({
+            "2023-12-31": 9.0, "2024-03-31": 10.0, "2024-06-30": 20.0, "2024-09-30": 30.0,
+            "2024-12-31": 40.0, "2025-03-31": 50.0,
+        })
+
+        rows = self.run_history(ni, ie, reval)
+
+        self.assertEqual([row["period"] for row in rows], ["2024-03-31", "2024-06-30", "2024-12-31", "2025-03-31"])
+        self.assertEqual(
+            list(rows[0]),
+            ["period", "reported_ni", "reval", "interest", "adj_ni", "adj_ni_no_debt"],
+        )
+        self.assertEqual(rows[-1], {
+            "period": "2025-03-31",
+            "reported_ni": 500.0,
+            "reval": 50.0,
+            "interest": 5.0,
+            "adj_ni": 450.0,
+            "adj_ni_no_debt": 455.0,
+        })
+
+    def test_tail_drops_older_common_periods(self):
+        ends = ["2024-03-31", "2024-06-30", "2024-09-30", "2024-12-31", "2025-03-31", "2025-06-30"]
+        ni = _series({end: 100.0 * i for i, end in enumerate(ends, 1)})
+        ie = _series({end: 1.0 for end in ends})
+        reval = _series({end: 10.0 for end in ends})
+
+        rows = self.run_history(ni, ie, reval)
+
+        self.assertEqual([row["period"] for row in rows], ends[-4:])
+        self.assertEqual([row["adj_ni"] for row in rows], [290.0, 390.0, 490.0, 590.0])
+
+    def test_missing_series_returns_no_rows(self):
+        ni = _series({"2025-03-31": 500.0})
+        self.assertEqual(self.run_history(ni, {}, _series({"2025-03-31": 50.0})), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
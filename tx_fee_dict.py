@@ -41,14 +41,30 @@
 
 # 1. Import the requests library so we can fetch data from the mempool.space API.
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # optional: faster JSON parsing than the stdlib json behind response.json()
+except ImportError:
+    orjson = None
+
+# One keep-alive session for every mempool.space call (reuses the TCP+TLS connection)
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=10,
+    # connect/read timeouts bound each try; transient 429/5xx get a short backoff and retry
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"]),
+))
 
 # 2. Send a GET request to "https://mempool.space/api/mempool/recent" and store the response.
-response = requests.get("https://mempool.space/api/mempool/recent")
+response = SESSION.get("https://mempool.space/api/mempool/recent", timeout=(3, 5))
 
 # print(data[0]) // here ive commented out this checkpoint because it will be in the way with future steps :)
 
 # 3. Convert the response to JSON (it will become a Python list of transaction dictionaries).
-data = response.json() #the reason for starting with data is because the response is a json object and we want to convert it to a python dictionary so basically we are grabbing the "response" and making it work as a python dictionary
+data = orjson.loads(response.content) if orjson is not None else response.json() #the reason for starting with data is because the response is a json object and we want to convert it to a python dictionary so basically we are grabbing the "response" and making it work as a python dictionary
 
 # print(data[0]) // here ive commented out this checkpoint because it will be in the way with future steps :)
 
@@ -70,11 +86,8 @@ print("Recent Bitcoin Transactions and Their Fees")
 print("-" * 50)
 
 for txid, fee_rate in fees.items():
-    # Find the transaction in data to get its vsize
-    tx = next((tx for tx in data[:5] if tx['txid'] == txid), None)
-    if tx:
-        fee_rate = tx['fee'] / tx['vsize']
-        print(f"Transaction {txid}: {fee_rate:.2f} sat/vB")
+    # fees already holds sat/vB per txid, no need to look the transaction back up
+    print(f"Transaction {txid}: {fee_rate:.2f} sat/vB")
 
 
 
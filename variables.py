@@ -10,8 +10,7 @@ STRIKE_API_KEY = "your_api_key_here"
 name = "Peyton"
 project = "Bitcoin CLI sprint"
 # Print: "Peyton is crushing Day 3 of the Bitcoin CLI sprint!"
-print(name + " is crushing Day 3 of the " + project + "!")
-print(f"{name} is crushing Day 3 of the {project}!") #trying both
+print(f"{name} is crushing Day 3 of the {project}!") # f-string builds it in one step, no + intermediates
 # Bonus: Try it with + and with f-strings
 
 